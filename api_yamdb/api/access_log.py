@@ -0,0 +1,119 @@
+import atexit
+import json
+import os
+import queue
+import threading
+
+from api_yamdb.settings import (ACCESS_LOG_BACKUP_COUNT, ACCESS_LOG_BATCH_SIZE,
+                                ACCESS_LOG_FLUSH_INTERVAL,
+                                ACCESS_LOG_MAX_BYTES, ACCESS_LOG_PATH,
+                                ACCESS_LOG_QUEUE_SIZE)
+
+from api.metrics import registry
+
+STOP = object()
+
+
+class AccessLogWriter:
+    def __init__(self, path=ACCESS_LOG_PATH, queue_size=ACCESS_LOG_QUEUE_SIZE,
+                 batch_size=ACCESS_LOG_BATCH_SIZE,
+                 flush_interval=ACCESS_LOG_FLUSH_INTERVAL,
+                 max_bytes=ACCESS_LOG_MAX_BYTES,
+                 backup_count=ACCESS_LOG_BACKUP_COUNT):
+        self.path = path
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.lock = threading.Lock()
+        self.dropped = 0
+        self.pid = None
+        self.queue = None
+        self.thread = None
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def ensure_started(self):
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.queue = queue.Queue(maxsize=self.queue_size)
+            self.thread = threading.Thread(
+                target=self.run, name='access-log-writer', daemon=True
+            )
+            self.thread.start()
+            self.pid = os.getpid()
+
+    def log(self, record):
+        self.ensure_started()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+            registry.inc('yamdb_access_log_dropped_total', {})
+
+    def run(self):
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = STOP in batch
+            records = [item for item in batch if item is not STOP]
+            try:
+                self.write(records)
+            except OSError:
+                with self.lock:
+                    self.dropped += len(records)
+            if stop:
+                return
+
+    def write(self, records):
+        if not records:
+            return
+        data = ''.join(
+            json.dumps(record, ensure_ascii=False) + '\n'
+            for record in records
+        ).encode()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if (os.path.exists(self.path)
+                and os.path.getsize(self.path) + len(data) > self.max_bytes):
+            self.rotate()
+        with open(self.path, 'ab') as log_file:
+            log_file.write(data)
+
+    def rotate(self):
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f'{self.path}.{index}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.path}.{index + 1}')
+        if self.backup_count:
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
+
+    def close(self, timeout=5):
+        if self.pid != os.getpid():
+            return
+        try:
+            self.queue.put(STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout)
+        self.pid = None
+
+
+access_log = AccessLogWriter()
+atexit.register(access_log.close)
@@ -3,3 +3,14 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        import os
+
+        import api.signals  # noqa: F401
+        from api.sampling import restart_after_fork, start_sampler
+        from api_yamdb.settings import SAMPLING_PROFILER_ENABLED
+
+        if SAMPLING_PROFILER_ENABLED:
+            start_sampler()
+            os.register_at_fork(after_in_child=restart_after_fork)
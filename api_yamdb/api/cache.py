@@ -0,0 +1,59 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api_yamdb.settings import CACHE_KEY_PREFIX, CACHE_SINGLE_PROCESS
+
+from api.metrics import record_cache
+
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+def make_key(*parts):
+    raw = ':'.join(str(part) for part in parts)
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'{CACHE_KEY_PREFIX}:{parts[0]}:{digest}'
+
+
+def query_params_key(query_params):
+    return '&'.join(
+        f'{name}={value}'
+        for name, values in sorted(query_params.lists())
+        for value in sorted(values)
+    )
+
+
+def get_cached(key, cache_name):
+    value = cache.get(key)
+    record_cache(cache_name, value is not None)
+    return value
+
+
+def get_version(name):
+    key = f'{CACHE_KEY_PREFIX}:version:{name}'
+    return cache.get_or_set(key, time.time_ns(), None)
+
+
+def bump_version(name):
+    key = f'{CACHE_KEY_PREFIX}:version:{name}'
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, None)
+        return version
+
+
+def versioned_cache_enabled():
+    """Whether caches invalidated through version counters may be used.
+
+    A version bumped in a process-local cache is invisible to the other
+    workers, which would keep serving stale entries until they expire.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    return CACHE_SINGLE_PROCESS or backend not in PROCESS_LOCAL_BACKENDS
@@ -0,0 +1,267 @@
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.relations import (ManyRelatedField,
+                                      PrimaryKeyRelatedField,
+                                      SlugRelatedField)
+
+from api.fragments import Fragment, is_cached_model
+from api.timing import timed
+from api.tracing import span
+
+PK_COLUMN = 'pk'
+
+
+class Unsupported(Exception):
+    pass
+
+
+def get_converter(field):
+    to_representation = type(field).to_representation
+    if to_representation is serializers.CharField.to_representation:
+        return None
+    return field.to_representation
+
+
+def get_model_field(model, source):
+    try:
+        return model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+
+
+class ValueStep:
+    def __init__(self, name, column, convert):
+        self.name = name
+        self.column = column
+        self.convert = convert
+
+    def columns(self):
+        return (self.column,)
+
+    def __call__(self, row, related):
+        value = row[self.column]
+        if value is None or self.convert is None:
+            return value
+        return self.convert(value)
+
+
+class AnnotationStep(ValueStep):
+    pass
+
+
+class NestedStep:
+    def __init__(self, name, column, plan):
+        self.name = name
+        self.column = column
+        self.plan = plan
+
+    def columns(self):
+        return (self.column, *self.plan.columns())
+
+    def __call__(self, row, related):
+        if row[self.column] is None:
+            return None
+        return self.plan.build(row, related)
+
+
+class FragmentStep:
+    def __init__(self, name, column, fragment):
+        self.name = name
+        self.column = column
+        self.fragment = fragment
+
+    def columns(self):
+        return (self.column,)
+
+    def prepare(self, rows):
+        return self.fragment.get_many(
+            {row[self.column] for row in rows} - {None}
+        )
+
+    def __call__(self, row, related):
+        pk = row[self.column]
+        if pk is None:
+            return None
+        return related[self][pk]
+
+
+class ManyStep:
+    def __init__(self, name, model_field, fragment):
+        self.name = name
+        self.model = model_field.related_model
+        self.query_name = model_field.related_query_name()
+        self.fragment = fragment
+        self.cached = is_cached_model(self.model)
+
+    def columns(self):
+        return ()
+
+    def prepare(self, rows):
+        ids = [row[PK_COLUMN] for row in rows]
+        if not ids:
+            return {}
+        queryset = self.model._default_manager.filter(
+            **{f'{self.query_name}__in': ids}
+        )
+        grouped = defaultdict(list)
+        if not self.cached:
+            rows = queryset.values(self.query_name, *self.fragment.columns)
+            for row in rows:
+                grouped[row[self.query_name]].append(self.fragment.build(row))
+            return grouped
+        pairs = list(queryset.values_list(self.query_name, 'pk'))
+        fragments = self.fragment.get_many({pk for _, pk in pairs})
+        for owner, pk in pairs:
+            if pk in fragments:
+                grouped[owner].append(fragments[pk])
+        return grouped
+
+    def __call__(self, row, related):
+        return related[self].get(row[PK_COLUMN], [])
+
+
+class RowPlan:
+    def __init__(self, steps):
+        self.steps = steps
+
+    def columns(self):
+        return [column for step in self.steps for column in step.columns()]
+
+    def build(self, row, related):
+        return {step.name: step(row, related) for step in self.steps}
+
+
+class CompiledSerializer:
+    """Read-only serializer built once from a DRF serializer's fields.
+
+    Works on ``values()`` rows instead of model instances and produces the
+    same representation as ``serializer.data``; many-to-many fields are
+    loaded with one query per field, like ``prefetch_related``. Related
+    objects of FRAGMENT_CACHE_MODELS are taken from the fragment cache.
+    """
+
+    def __init__(self, serializer):
+        self.name = type(serializer).__name__
+        self.model = serializer.Meta.model
+        self.plan = compile_fields(serializer, self.model)
+
+    def bind(self, queryset):
+        annotations = queryset.query.annotations
+        steps = [
+            step for step in self.plan.steps
+            if not isinstance(step, AnnotationStep)
+            or step.column in annotations
+        ]
+        return RowPlan(steps)
+
+    def values(self, queryset, *extra):
+        plan = self.bind(queryset)
+        columns = dict.fromkeys((PK_COLUMN, *plan.columns(), *extra))
+        return queryset.prefetch_related(None).values(*columns)
+
+    def serialize(self, rows, queryset):
+        plan = self.bind(queryset)
+        rows = list(rows)
+        with timed('serializer'), span(
+            'serializer', **{'serializer.class': self.name,
+                             'serializer.compiled': True}
+        ):
+            related = {
+                step: step.prepare(rows) for step in plan.steps
+                if isinstance(step, (FragmentStep, ManyStep))
+            }
+            return [plan.build(row, related) for row in rows]
+
+
+def compile_fields(serializer, model, prefix='', fragments=True):
+    steps = []
+    for name, field in serializer.fields.items():
+        if not field.write_only:
+            steps.append(
+                compile_field(name, field, model, prefix, fragments)
+            )
+    return RowPlan(steps)
+
+
+def compile_field(name, field, model, prefix, fragments):
+    source = field.source
+    if source == '*' or '.' in source:
+        raise Unsupported(name)
+    column = prefix + source
+    model_field = get_model_field(model, source)
+    if model_field is None:
+        if (
+            prefix
+            or isinstance(field, (serializers.BaseSerializer,
+                                  ManyRelatedField))
+            or hasattr(model, source)
+            or field.default is not empty
+        ):
+            raise Unsupported(name)
+        return AnnotationStep(name, column, get_converter(field))
+    if model_field.many_to_many and model_field.concrete and not prefix:
+        return compile_many(name, field, model_field)
+    if model_field.is_relation:
+        return compile_relation(
+            name, field, model_field, column, fragments and not prefix
+        )
+    return ValueStep(name, column, get_converter(field))
+
+
+def compile_many(name, field, model_field):
+    related_model = model_field.related_model
+    if isinstance(field, serializers.ListSerializer):
+        plan = compile_fields(field.child, related_model, fragments=False)
+        return ManyStep(name, model_field, Fragment(related_model, plan))
+    if (
+        isinstance(field, ManyRelatedField)
+        and type(field.child_relation) is SlugRelatedField
+    ):
+        return ManyStep(name, model_field, Fragment(
+            related_model, slug=field.child_relation.slug_field
+        ))
+    raise Unsupported(name)
+
+
+def compile_relation(name, field, model_field, column, fragments):
+    if not model_field.concrete or model_field.many_to_many:
+        raise Unsupported(name)
+    related_model = model_field.related_model
+    cached = fragments and is_cached_model(related_model)
+    if type(field) is SlugRelatedField:
+        if cached:
+            return FragmentStep(name, column, Fragment(
+                related_model, slug=field.slug_field
+            ))
+        return ValueStep(name, f'{column}__{field.slug_field}', None)
+    if type(field) is PrimaryKeyRelatedField and field.pk_field is None:
+        return ValueStep(name, column, None)
+    if isinstance(field, serializers.Serializer):
+        if cached:
+            plan = compile_fields(field, related_model, fragments=False)
+            return FragmentStep(name, column, Fragment(related_model, plan))
+        return NestedStep(name, column, compile_fields(
+            field, related_model, f'{column}__', fragments=False
+        ))
+    raise Unsupported(name)
+
+
+_compiled = {}
+
+
+def get_compiled_serializer(serializer_class, key, factory):
+    """Return the compiled form of a serializer, or None if unsupported.
+
+    ``key`` identifies the field set (e.g. the sparse fieldset of the
+    request); ``factory`` creates the serializer on the first call.
+    """
+    cache_key = (serializer_class, key)
+    if cache_key not in _compiled:
+        try:
+            _compiled[cache_key] = CompiledSerializer(factory())
+        except Unsupported:
+            _compiled[cache_key] = None
+    return _compiled[cache_key]
@@ -0,0 +1,90 @@
+import threading
+
+from django.db import connection, transaction
+from django.db.models import Avg, F
+
+from reviews.models import Title
+from api_yamdb.settings import TITLE_DOCUMENTS_BATCH_SIZE
+
+from api.renderers import FastJSONRenderer
+from api.serializers import ReadOnlyTitleSerializer
+
+pending = threading.local()
+
+
+def render_document(title):
+    return FastJSONRenderer().encode(
+        ReadOnlyTitleSerializer(title).data
+    ).decode()
+
+
+def lock_titles(title_ids):
+    titles = Title.objects.filter(pk__in=title_ids)
+    if connection.features.has_select_for_update:
+        list(
+            titles.select_for_update().order_by('pk')
+            .values_list('pk', flat=True)
+        )
+    else:
+        titles.update(document=F('document'))
+
+
+def refresh_documents(title_ids):
+    """Render and store the documents of the given titles.
+
+    The title rows are locked before anything is read, so concurrent
+    refreshes run one after another and the last one always renders the
+    latest committed state instead of overwriting it with an older one.
+    Databases without SELECT ... FOR UPDATE (SQLite) take the write lock
+    with a no-op UPDATE instead, so the transaction never has to upgrade a
+    read lock.
+    """
+    title_ids = sorted(set(title_ids))
+    for start in range(0, len(title_ids), TITLE_DOCUMENTS_BATCH_SIZE):
+        batch = title_ids[start:start + TITLE_DOCUMENTS_BATCH_SIZE]
+        with transaction.atomic():
+            lock_titles(batch)
+            titles = list(
+                Title.objects.filter(pk__in=batch)
+                .annotate(rating=Avg('reviews__score'))
+                .select_related('category').prefetch_related('genre')
+            )
+            for title in titles:
+                title.document = render_document(title)
+            Title.objects.bulk_update(titles, ['document'])
+
+
+def flush_documents():
+    title_ids = getattr(pending, 'title_ids', None)
+    pending.title_ids = set()
+    if title_ids:
+        refresh_documents(title_ids)
+
+
+def mark_dirty(title_ids):
+    """Regenerate the documents of these titles once the transaction commits.
+
+    Ids marked within one transaction are refreshed together; outside of a
+    transaction the refresh runs immediately.
+    """
+    if not hasattr(pending, 'title_ids'):
+        pending.title_ids = set()
+    pending.title_ids.update(title_ids)
+    transaction.on_commit(flush_documents)
+
+
+def complete_documents(rows):
+    """Return the documents of ``(pk, document)`` rows, building missing ones.
+
+    Titles created or changed in bulk carry no document yet; they are
+    rendered and stored on first read.
+    """
+    missing = [pk for pk, document in rows if document is None]
+    if not missing:
+        return [document for _, document in rows]
+    refresh_documents(missing)
+    documents = dict(rows)
+    documents.update(
+        Title.objects.filter(pk__in=missing).values_list('pk', 'document')
+    )
+    return [documents[pk] for pk, _ in rows if documents[pk] is not None]
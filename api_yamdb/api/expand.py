@@ -0,0 +1,62 @@
+from django.db.models import OuterRef, Subquery
+from rest_framework.exceptions import ValidationError
+
+from reviews.models import Comment
+from api_yamdb.settings import EXPAND_DEFAULT_LIMIT, EXPAND_MAX_LIMIT
+
+from api.serializers import CommentSerializer, ReviewSerializer
+from api.utils import split_param
+
+EXPAND_PARAM = 'expand'
+EXPAND_LIMIT_PARAM = 'expand_limit'
+TITLE_EXPANSIONS = ('reviews', 'reviews.comments')
+
+
+def get_expand_params(request):
+    expand = split_param(request.query_params.get(EXPAND_PARAM, ''))
+    unknown = expand - set(TITLE_EXPANSIONS)
+    if unknown:
+        raise ValidationError(
+            {EXPAND_PARAM: f'Неизвестные значения: {", ".join(unknown)}'}
+        )
+    try:
+        limit = int(
+            request.query_params.get(EXPAND_LIMIT_PARAM, EXPAND_DEFAULT_LIMIT)
+        )
+    except ValueError:
+        raise ValidationError({EXPAND_LIMIT_PARAM: 'Ожидается целое число'})
+    if not 1 <= limit <= EXPAND_MAX_LIMIT:
+        raise ValidationError(
+            {EXPAND_LIMIT_PARAM: f'Допустимо значение от 1 до '
+                                 f'{EXPAND_MAX_LIMIT}'}
+        )
+    return expand, limit
+
+
+def expand_title(title, expand, limit, context):
+    reviews = list(
+        title.reviews.select_related('author', 'title')
+        .order_by('-pub_date', '-id')[:limit]
+    )
+    data = ReviewSerializer(reviews, many=True, context=context).data
+    if 'reviews.comments' not in expand:
+        return data
+
+    latest = (
+        Comment.objects.filter(review=OuterRef('review'))
+        .order_by('-pub_date', '-id')
+        .values('id')[:limit]
+    )
+    comments = (
+        Comment.objects.filter(review__in=reviews, id__in=Subquery(latest))
+        .select_related('author', 'review')
+        .order_by('-pub_date', '-id')
+    )
+    by_review = {review.id: [] for review in reviews}
+    for comment in comments:
+        by_review[comment.review_id].append(comment)
+    for review_data in data:
+        review_data['comments'] = CommentSerializer(
+            by_review[review_data['id']], many=True, context=context
+        ).data
+    return data
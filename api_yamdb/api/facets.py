@@ -0,0 +1,32 @@
+from django.db.models import Count, F
+
+from reviews.models import Category, Genre, Title
+
+
+def get_title_facets(queryset):
+    title_ids = queryset.values('id')
+    genres = (
+        Genre.objects.filter(title__in=title_ids)
+        .values('slug', 'name')
+        .annotate(count=Count('title', distinct=True))
+        .order_by('-count', 'slug')
+    )
+    categories = (
+        Category.objects.filter(titles__in=title_ids)
+        .values('slug', 'name')
+        .annotate(count=Count('titles'))
+        .order_by('-count', 'slug')
+    )
+    titles = Title.objects.filter(id__in=title_ids)
+    decades = (
+        titles.annotate(decade=F('year') / 10 * 10)
+        .values('decade')
+        .annotate(count=Count('id'))
+        .order_by('decade')
+    )
+    return {
+        'count': titles.count(),
+        'genre': list(genres),
+        'category': list(categories),
+        'decade': list(decades),
+    }
@@ -15,6 +15,7 @@ class TitleFilter(rest_framework.FilterSet):
     genre = rest_framework.CharFilter(
         field_name='genre__slug',
         lookup_expr='icontains',
+        distinct=True,
     )
 
     class Meta:
@@ -0,0 +1,75 @@
+from django.core.cache import cache
+
+from api_yamdb.settings import FRAGMENT_CACHE_MODELS, FRAGMENT_CACHE_TIMEOUT
+
+from api.cache import get_version, make_key, versioned_cache_enabled
+from api.metrics import record_cache
+
+FRAGMENTS_CACHE = 'fragments'
+
+
+def fragments_version_name(model):
+    return f'fragments:{model._meta.label_lower}'
+
+
+def is_cached_model(model):
+    return model._meta.label_lower in FRAGMENT_CACHE_MODELS
+
+
+class Fragment:
+    """Serialized form of a related object, cached by its primary key.
+
+    ``plan`` builds a nested serializer's dict from a ``values()`` row;
+    without it the fragment is the value of a single ``slug`` column.
+    """
+
+    def __init__(self, model, plan=None, slug=None):
+        self.model = model
+        self.plan = plan
+        self.slug = slug
+        self.columns = plan.columns() if plan else [slug]
+        self.signature = ','.join(self.columns)
+
+    def build(self, row):
+        if self.plan is None:
+            return row[self.slug]
+        return self.plan.build(row, None)
+
+    def fetch(self, pks):
+        return {
+            row['pk']: self.build(row)
+            for row in self.model._default_manager.filter(
+                pk__in=pks
+            ).values('pk', *self.columns)
+        }
+
+    def get_many(self, pks):
+        if not pks:
+            return {}
+        if not versioned_cache_enabled():
+            return self.fetch(pks)
+        version = get_version(fragments_version_name(self.model))
+        keys = {
+            pk: make_key(
+                FRAGMENTS_CACHE, self.model._meta.label_lower,
+                self.signature, version, pk,
+            )
+            for pk in pks
+        }
+        cached = cache.get_many(keys.values())
+        fragments = {
+            pk: cached[key] for pk, key in keys.items() if key in cached
+        }
+        missing = [pk for pk in keys if pk not in fragments]
+        if fragments:
+            record_cache(FRAGMENTS_CACHE, True, len(fragments))
+        if not missing:
+            return fragments
+        record_cache(FRAGMENTS_CACHE, False, len(missing))
+        built = self.fetch(missing)
+        cache.set_many(
+            {keys[pk]: fragment for pk, fragment in built.items()},
+            FRAGMENT_CACHE_TIMEOUT,
+        )
+        fragments.update(built)
+        return fragments
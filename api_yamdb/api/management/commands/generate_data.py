@@ -0,0 +1,347 @@
+import csv
+import random
+import re
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+from api_yamdb.settings import BASE_DIR
+
+from api.cache import bump_version
+from api.documents import refresh_documents
+from api.signals import CATALOG_VERSION
+
+DATA_DIR = BASE_DIR / 'static' / 'data'
+BASE_DATE = datetime(2019, 1, 1, tzinfo=timezone.utc)
+DATE_RANGE_SECONDS = 4 * 365 * 24 * 60 * 60
+
+FALLBACK_WORDS = (
+    'фильм книга герой сюжет автор история время жизнь мир конец финал '
+    'режиссёр актёр роль сцена музыка глава страница смысл идея вопрос '
+    'ответ любовь дружба война память дорога город дом ночь утро'
+).split()
+CATEGORY_NAMES = (
+    'Фильм', 'Книга', 'Музыка', 'Сериал', 'Игра', 'Спектакль', 'Комикс',
+    'Мультфильм', 'Подкаст', 'Аудиокнига',
+)
+GENRE_NAMES = (
+    'Драма', 'Комедия', 'Вестерн', 'Фэнтези', 'Фантастика', 'Детектив',
+    'Триллер', 'Сказка', 'Гонзо', 'Ужасы', 'Роман', 'Боевик', 'Рок',
+    'Классика', 'Мелодрама', 'Документальный', 'Приключения', 'Нуар',
+)
+ROLES = ('user', 'moderator', 'admin')
+ROLE_WEIGHTS = (95, 4, 1)
+
+TABLES = {
+    'category': ('id', 'name', 'slug'),
+    'genre': ('id', 'name', 'slug'),
+    'titles': ('id', 'name', 'year', 'category'),
+    'genre_title': ('id', 'title_id', 'genre_id'),
+    'users': ('id', 'username', 'email', 'role', 'bio', 'first_name',
+              'last_name'),
+    'review': ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date'),
+    'comments': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+
+
+def load_vocabulary():
+    words = []
+    for name in ('review', 'comments'):
+        path = DATA_DIR / f'{name}.csv'
+        if path.exists():
+            with open(path, encoding='utf-8') as csv_file:
+                for row in csv.DictReader(csv_file):
+                    words.extend(re.findall(r'[А-Яа-яЁё]+', row['text']))
+    return [word.lower() for word in words] or FALLBACK_WORDS
+
+
+def power_law_cum_weights(size, skew, rng):
+    weights = [1 / (rank + 1) ** skew for rank in range(size)]
+    rng.shuffle(weights)
+    return list(accumulate(weights))
+
+
+def choose(cum_weights, rng):
+    return bisect_left(cum_weights, rng.random() * cum_weights[-1])
+
+
+class Generator:
+    def __init__(self, options):
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        self.vocabulary = load_vocabulary()
+
+    def sentence(self, min_words, max_words):
+        words = self.rng.choices(
+            self.vocabulary, k=self.rng.randint(min_words, max_words)
+        )
+        return ' '.join(words).capitalize()
+
+    def text(self, mean_sentences):
+        count = max(1, int(self.rng.lognormvariate(0, 0.8) * mean_sentences))
+        return '. '.join(self.sentence(4, 18) for _ in range(count)) + '.'
+
+    def date(self):
+        return BASE_DATE + timedelta(
+            seconds=self.rng.randrange(DATE_RANGE_SECONDS)
+        )
+
+    def categories(self, start):
+        for index in range(self.options['categories']):
+            name = CATEGORY_NAMES[index % len(CATEGORY_NAMES)]
+            yield {
+                'id': start + index,
+                'name': f'{name} {index // len(CATEGORY_NAMES) or ""}'.strip(),
+                'slug': f'category-{start + index}',
+            }
+
+    def genres(self, start):
+        for index in range(self.options['genres']):
+            name = GENRE_NAMES[index % len(GENRE_NAMES)]
+            yield {
+                'id': start + index,
+                'name': f'{name} {index // len(GENRE_NAMES) or ""}'.strip(),
+                'slug': f'genre-{start + index}',
+            }
+
+    def users(self, start):
+        for user_id in range(start, start + self.options['users']):
+            yield {
+                'id': user_id,
+                'username': f'user{user_id}',
+                'email': f'user{user_id}@yamdb.fake',
+                'role': self.rng.choices(ROLES, ROLE_WEIGHTS)[0],
+                'bio': self.sentence(3, 12) if self.rng.random() < 0.3 else '',
+                'first_name': '',
+                'last_name': '',
+            }
+
+    def titles(self, start, category_ids):
+        for title_id in range(start, start + self.options['titles']):
+            yield {
+                'id': title_id,
+                'name': self.sentence(1, 4),
+                'year': self.rng.randint(1900, 2023),
+                'category': self.rng.choice(category_ids),
+                'description': self.text(3),
+            }
+
+    def genre_titles(self, start, title_ids, genre_ids):
+        row_id = start
+        for title_id in title_ids:
+            for genre_id in self.rng.sample(
+                genre_ids, min(len(genre_ids), self.rng.randint(1, 3))
+            ):
+                yield {'id': row_id, 'title_id': title_id,
+                       'genre_id': genre_id}
+                row_id += 1
+
+    def reviews(self, start, title_ids, user_ids):
+        cum_weights = power_law_cum_weights(
+            len(title_ids), self.options['skew'], self.rng
+        )
+        counts = [0] * len(title_ids)
+        for _ in range(self.options['reviews']):
+            counts[choose(cum_weights, self.rng)] += 1
+        row_id = start
+        for title_id, count in zip(title_ids, counts):
+            # A user can review a title only once.
+            for author_id in self.rng.sample(
+                user_ids, min(count, len(user_ids))
+            ):
+                yield {
+                    'id': row_id,
+                    'title_id': title_id,
+                    'text': self.text(4),
+                    'author_id': author_id,
+                    'score': min(10, max(1, round(self.rng.gauss(7, 2)))),
+                    'pub_date': self.date(),
+                }
+                row_id += 1
+
+    def comments(self, start, review_ids, user_ids):
+        if not review_ids:
+            return
+        cum_weights = power_law_cum_weights(
+            len(review_ids), self.options['skew'], self.rng
+        )
+        for row_id in range(start, start + self.options['comments']):
+            yield {
+                'id': row_id,
+                'review_id': review_ids[choose(cum_weights, self.rng)],
+                'text': self.text(1),
+                'author': self.rng.choice(user_ids),
+                'pub_date': self.date(),
+            }
+
+
+class CsvSink:
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def start_ids(self):
+        return {table: 1 for table in TABLES}
+
+    def write(self, table, rows):
+        ids = []
+        with open(self.directory / f'{table}.csv', 'w', encoding='utf-8',
+                  newline='') as csv_file:
+            writer = csv.DictWriter(
+                csv_file, TABLES[table], extrasaction='ignore'
+            )
+            writer.writeheader()
+            for row in rows:
+                if isinstance(row.get('pub_date'), datetime):
+                    row['pub_date'] = row['pub_date'].isoformat(
+                        timespec='milliseconds'
+                    ).replace('+00:00', 'Z')
+                writer.writerow(row)
+                ids.append(row['id'])
+        return ids
+
+
+class DatabaseSink:
+    models = {
+        'category': (Category, {}),
+        'genre': (Genre, {}),
+        'titles': (Title, {'category': 'category_id'}),
+        'genre_title': (GenreTitle, {}),
+        'users': (User, {}),
+        'review': (Review, {}),
+        'comments': (Comment, {'author': 'author_id'}),
+    }
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+
+    def start_ids(self):
+        return {
+            table: (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+            for table, (model, _) in self.models.items()
+        }
+
+    def reset_sequences(self):
+        # Rows are inserted with explicit ids, which leaves sequences
+        # (e.g. on PostgreSQL) behind the data.
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [model for model, _ in self.models.values()]
+        )
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def build(self, table, row):
+        model, renames = self.models[table]
+        data = {renames.get(key, key): value for key, value in row.items()}
+        if model is User:
+            data['password'] = '!'
+        obj = model(**data)
+        if 'pub_date' in data:
+            obj.generated_pub_date = data['pub_date']
+        return obj
+
+    def insert(self, model, batch):
+        model.objects.bulk_create(batch)
+        if batch and hasattr(batch[0], 'pub_date'):
+            # auto_now_add overrides pub_date on insert, restore the
+            # generated dates.
+            dates = [obj.generated_pub_date for obj in batch]
+            for obj, pub_date in zip(batch, dates):
+                obj.pub_date = pub_date
+            model.objects.bulk_update(batch, ['pub_date'])
+
+    def write(self, table, rows):
+        model, _ = self.models[table]
+        ids = []
+        batch = []
+        for row in rows:
+            batch.append(self.build(table, row))
+            ids.append(row['id'])
+            if len(batch) >= self.batch_size:
+                self.insert(model, batch)
+                batch = []
+        self.insert(model, batch)
+        return ids
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует синтетические данные: пользователей, произведения, '
+        'отзывы и комментарии со степенным распределением популярности.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--titles', type=int, default=5000)
+        parser.add_argument('--reviews', type=int, default=50000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument(
+            '--skew', type=float, default=1.1,
+            help='Показатель степенного распределения популярности.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--csv', metavar='DIR',
+            help='Записать CSV в формате static/data вместо записи в БД.'
+        )
+
+    def handle(self, *args, **options):
+        for name in ('users', 'categories', 'genres', 'titles'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} должно быть больше нуля')
+        generator = Generator(options)
+        if options['csv']:
+            counts, _ = self.generate(generator, CsvSink(options['csv']))
+        else:
+            sink = DatabaseSink(options['batch_size'])
+            with transaction.atomic():
+                counts, title_ids = self.generate(generator, sink)
+                sink.reset_sequences()
+                # Bulk inserts skip signals, so the new titles are rendered
+                # here; reviews only go to new titles, existing ones keep
+                # their documents.
+                refresh_documents(title_ids)
+            bump_version(CATALOG_VERSION)
+        for table, count in counts.items():
+            self.stdout.write(f'{table}: {count}')
+
+    def generate(self, generator, sink):
+        start = sink.start_ids()
+        category_ids = sink.write(
+            'category', generator.categories(start['category'])
+        )
+        genre_ids = sink.write('genre', generator.genres(start['genre']))
+        user_ids = sink.write('users', generator.users(start['users']))
+        title_ids = sink.write(
+            'titles', generator.titles(start['titles'], category_ids)
+        )
+        genre_title_ids = sink.write('genre_title', generator.genre_titles(
+            start['genre_title'], title_ids, genre_ids
+        ))
+        review_ids = sink.write('review', generator.reviews(
+            start['review'], title_ids, user_ids
+        ))
+        comment_ids = sink.write('comments', generator.comments(
+            start['comments'], review_ids, user_ids
+        ))
+        return {
+            'category': len(category_ids),
+            'genre': len(genre_ids),
+            'users': len(user_ids),
+            'titles': len(title_ids),
+            'genre_title': len(genre_title_ids),
+            'review': len(review_ids),
+            'comments': len(comment_ids),
+        }, title_ids
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+
+from api.documents import refresh_documents
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает сохранённые JSON-документы произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing', action='store_true',
+            help='Обновить только произведения без документа.'
+        )
+
+    def handle(self, *args, **options):
+        titles = Title.objects.all()
+        if options['missing']:
+            titles = titles.filter(document__isnull=True)
+        title_ids = list(titles.values_list('pk', flat=True))
+        refresh_documents(title_ids)
+        self.stdout.write(f'titles: {len(title_ids)}')
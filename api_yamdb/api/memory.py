@@ -0,0 +1,125 @@
+import threading
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+
+from api_yamdb.settings import MEMORY_PROFILER_FRAMES, MEMORY_PROFILER_TOP
+
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False
+
+
+@contextmanager
+def memory_tracing():
+    """Trace allocations only while at least one sampled request runs.
+
+    Unsampled requests pay no tracemalloc overhead; concurrent sampled
+    requests share one tracing session.
+    """
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_PROFILER_FRAMES)
+            _tracing_started = True
+        _tracing_users += 1
+    try:
+        yield
+    finally:
+        with _tracing_lock:
+            _tracing_users -= 1
+            if _tracing_users == 0 and _tracing_started:
+                tracemalloc.stop()
+                _tracing_started = False
+
+
+def take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+def format_site(stat):
+    frame = stat.traceback[0]
+    return f'{frame.filename}:{frame.lineno}'
+
+
+class MemoryStats:
+    def __init__(self, recent=50):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.recent = deque(maxlen=recent)
+
+    def record(self, route, before, after):
+        stats = after.compare_to(before, 'lineno')
+        growth = sum(stat.size_diff for stat in stats)
+        top = [
+            stat for stat in sorted(
+                stats, key=lambda stat: stat.size_diff, reverse=True
+            )[:MEMORY_PROFILER_TOP]
+            if stat.size_diff > 0
+        ]
+        with self.lock:
+            route_stats = self.routes.setdefault(route, {
+                'samples': 0,
+                'total_growth': 0,
+                'max_growth': 0,
+                'sites': Counter(),
+            })
+            route_stats['samples'] += 1
+            route_stats['total_growth'] += growth
+            route_stats['max_growth'] = max(route_stats['max_growth'], growth)
+            for stat in top:
+                route_stats['sites'][format_site(stat)] += stat.size_diff
+            self.recent.append({
+                'route': route,
+                'growth': growth,
+                'top': [
+                    {
+                        'site': format_site(stat),
+                        'size_diff': stat.size_diff,
+                        'count_diff': stat.count_diff,
+                    }
+                    for stat in top
+                ],
+            })
+        return growth
+
+    def summary(self):
+        with self.lock:
+            routes = {
+                route: {
+                    'samples': stats['samples'],
+                    'total_growth': stats['total_growth'],
+                    'avg_growth': stats['total_growth'] // stats['samples'],
+                    'max_growth': stats['max_growth'],
+                    'top_sites': [
+                        {'site': site, 'size_diff': size}
+                        for site, size in stats['sites'].most_common(
+                            MEMORY_PROFILER_TOP
+                        )
+                    ],
+                }
+                for route, stats in self.routes.items()
+            }
+            recent = list(self.recent)
+        return {
+            'tracing': tracemalloc.is_tracing(),
+            'traced_memory': tracemalloc.get_traced_memory(),
+            'routes': routes,
+            'recent': recent,
+        }
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+            self.recent.clear()
+
+
+memory_stats = MemoryStats()
@@ -0,0 +1,221 @@
+import json
+import os
+import threading
+from collections import defaultdict
+
+from api_yamdb.settings import METRICS_DIR, METRICS_FLUSH_INTERVAL
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+METRIC_HELP = {
+    'yamdb_http_requests_total': ('counter', 'HTTP requests by route.'),
+    'yamdb_http_errors_total': ('counter', 'HTTP 5xx responses by route.'),
+    'yamdb_http_request_duration_seconds': (
+        'histogram', 'Request latency by route.'
+    ),
+    'yamdb_http_request_queries': (
+        'histogram', 'SQL queries per request by route.'
+    ),
+    'yamdb_cache_requests_total': (
+        'counter', 'Cache lookups by cache and result.'
+    ),
+    'yamdb_access_log_dropped_total': (
+        'counter', 'Access log records dropped on a full queue.'
+    ),
+    'yamdb_shadow_checks_total': (
+        'counter', 'Shadow verifications of fast read paths by result.'
+    ),
+}
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            name, str(value).replace('\\', '\\\\').replace('"', '\\"')
+        )
+        for name, value in labels
+    )
+    return '{' + pairs + '}'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    def __init__(self, directory=None, flush_interval=5):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self.timer = None
+        self.timer_pid = None
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] += value
+        self.maybe_flush()
+
+    def observe(self, name, labels, value, buckets):
+        key = (name, tuple(sorted(labels.items())), buckets)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0] * (len(buckets) + 2)
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+        self.maybe_flush()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [
+                    [name, labels, value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                'histograms': [
+                    [name, labels, buckets, list(values)]
+                    for (name, labels, buckets), values
+                    in self.histograms.items()
+                ],
+            }
+
+    def path(self):
+        return os.path.join(self.directory, f'{os.getpid()}.json')
+
+    def maybe_flush(self):
+        """Schedule a flush of the new samples within flush_interval.
+
+        The flush runs on a timer rather than on the next write, so a worker
+        that stops receiving requests still publishes its last samples.
+        """
+        if self.directory is None:
+            return
+        with self.lock:
+            if self.timer is not None and self.timer_pid == os.getpid():
+                return
+            self.timer = threading.Timer(self.flush_interval, self.flush)
+            self.timer.daemon = True
+            self.timer_pid = os.getpid()
+        self.timer.start()
+
+    def flush(self):
+        if self.directory is None:
+            return
+        with self.lock:
+            self.timer = None
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path()
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as tmp_file:
+            json.dump(self.snapshot(), tmp_file)
+        os.replace(tmp_path, path)
+
+    def snapshots(self):
+        if self.directory is None:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as data_file:
+                    snapshots.append(json.load(data_file))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def collect(self):
+        counters = defaultdict(float)
+        histograms = {}
+        for snapshot in self.snapshots():
+            for name, labels, value in snapshot['counters']:
+                counters[(name, tuple(map(tuple, labels)))] += value
+            for name, labels, buckets, values in snapshot['histograms']:
+                key = (name, tuple(map(tuple, labels)), tuple(buckets))
+                merged = histograms.setdefault(key, [0] * len(values))
+                for index, value in enumerate(values):
+                    merged[index] += value
+        return counters, histograms
+
+    def render(self):
+        counters, histograms = self.collect()
+        samples = defaultdict(list)
+        for (name, labels), value in sorted(counters.items()):
+            samples[name].append(
+                f'{name}{format_labels(labels)} {format_value(value)}'
+            )
+        for (name, labels, buckets), values in sorted(histograms.items()):
+            for bound, value in zip(buckets + (float('inf'),),
+                                    values[:-2] + [values[-1]]):
+                bucket_labels = labels + (('le', format_value(bound)),)
+                samples[name].append(
+                    f'{name}_bucket{format_labels(bucket_labels)} {value}'
+                )
+            samples[name].append(
+                f'{name}_sum{format_labels(labels)} '
+                f'{format_value(float(values[-2]))}'
+            )
+            samples[name].append(
+                f'{name}_count{format_labels(labels)} {values[-1]}'
+            )
+        lines = []
+        for name, metric_samples in samples.items():
+            metric_type, help_text = METRIC_HELP.get(name, ('untyped', ''))
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.extend(metric_samples)
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry(METRICS_DIR, METRICS_FLUSH_INTERVAL)
+
+
+def get_route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.url_name:
+        return 'unmatched'
+    return match.url_name
+
+
+def record_request(request, response, duration, queries):
+    route = get_route_name(request)
+    registry.inc('yamdb_http_requests_total', {
+        'route': route,
+        'method': request.method,
+        'status': response.status_code,
+    })
+    if response.status_code >= 500:
+        registry.inc(
+            'yamdb_http_errors_total',
+            {'route': route, 'method': request.method},
+        )
+    registry.observe(
+        'yamdb_http_request_duration_seconds',
+        {'route': route, 'method': request.method},
+        duration, LATENCY_BUCKETS,
+    )
+    registry.observe(
+        'yamdb_http_request_queries', {'route': route},
+        queries, QUERY_BUCKETS,
+    )
+
+
+def record_cache(cache_name, hit, count=1):
+    registry.inc('yamdb_cache_requests_total', {
+        'cache': cache_name,
+        'result': 'hit' if hit else 'miss',
+    }, count)
@@ -0,0 +1,283 @@
+import cProfile
+import gzip
+import hashlib
+import itertools
+import logging
+import os
+import random
+import re
+from contextlib import ExitStack, contextmanager
+from http import HTTPStatus
+from time import perf_counter, strftime, time
+
+from django.core.cache import cache
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from api_yamdb.settings import (COMPRESSION_CACHE_TIMEOUT, COMPRESSION_LEVEL,
+                                COMPRESSION_MIN_SIZE,
+                                MEMORY_PROFILER_SAMPLE_RATE, PROFILES_DIR,
+                                SERVER_TIMING_SAMPLE_RATE)
+
+from api.access_log import access_log
+from api.cache import get_cached, make_key
+from api.memory import memory_stats, memory_tracing, take_snapshot
+from api.metrics import get_route_name, record_request
+from api.queries import QueryStatsWrapper
+from api.timing import RequestTimings, current_timings, db_timing_wrapper
+from api.tracing import (SPAN_KIND_SERVER, current_trace, db_tracing_wrapper,
+                         exporter, span, start_trace)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+timing_logger = logging.getLogger('api.timing')
+
+re_accepts_gzip = re.compile(r'\bgzip\b')
+re_accepts_br = re.compile(r'\bbr\b')
+
+
+@contextmanager
+def execute_wrapper(wrapper):
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield
+
+
+def gzip_compress(body):
+    return gzip.compress(body, compresslevel=COMPRESSION_LEVEL, mtime=0)
+
+
+def brotli_compress(body):
+    return brotli.compress(body, quality=COMPRESSION_LEVEL)
+
+
+def choose_encoding(accept_encoding):
+    if brotli is not None and re_accepts_br.search(accept_encoding):
+        return 'br', brotli_compress
+    if re_accepts_gzip.search(accept_encoding):
+        return 'gzip', gzip_compress
+    return None, None
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.streaming
+                or response.has_header('Content-Encoding')
+                or len(response.content) < COMPRESSION_MIN_SIZE):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding, compress = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+
+        content = self.compress(request, response, encoding, compress)
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def compress(self, request, response, encoding, compress):
+        if (request.method not in ('GET', 'HEAD')
+                or response.status_code != HTTPStatus.OK):
+            return compress(response.content)
+        key = make_key(
+            'compressed', encoding,
+            hashlib.sha1(response.content).hexdigest(),
+        )
+        content = get_cached(key, 'compressed')
+        if content is None:
+            content = compress(response.content)
+            cache.set(key, content, COMPRESSION_CACHE_TIMEOUT)
+        return content
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (not SERVER_TIMING_SAMPLE_RATE
+                or random.random() >= SERVER_TIMING_SAMPLE_RATE):
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            with execute_wrapper(db_timing_wrapper):
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+
+        response['Server-Timing'] = timings.server_timing()
+        timing_logger.info(
+            'request timing',
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                **timings.as_fields(),
+            },
+        )
+        return response
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        started = perf_counter()
+        with execute_wrapper(count_queries):
+            response = self.get_response(request)
+        request.query_count = queries
+        record_request(request, response, perf_counter() - started, queries)
+        return response
+
+
+class QueryStatsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with execute_wrapper(QueryStatsWrapper(request)):
+            return self.get_response(request)
+
+
+class ProfilingMiddleware:
+    header = 'HTTP_X_PROFILE'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sequence = itertools.count(1)
+
+    def __call__(self, request):
+        if self.header not in request.META or not self.is_admin(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+
+        PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+        filename = '{}-{}-{}-{}.prof'.format(
+            strftime('%Y%m%d-%H%M%S'), get_route_name(request), os.getpid(),
+            next(self.sequence),
+        )
+        profiler.dump_stats(PROFILES_DIR / filename)
+        response['X-Profile-File'] = filename
+        return response
+
+    @staticmethod
+    def is_admin(request):
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except (AuthenticationFailed, InvalidToken):
+            return False
+        if result is None:
+            return False
+        user, _ = result
+        return user.is_admin or user.is_superuser
+
+
+class MemoryProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (not MEMORY_PROFILER_SAMPLE_RATE
+                or random.random() >= MEMORY_PROFILER_SAMPLE_RATE):
+            return self.get_response(request)
+
+        with memory_tracing():
+            before = take_snapshot()
+            response = self.get_response(request)
+            after = take_snapshot()
+        memory_stats.record(get_route_name(request), before, after)
+        return response
+
+
+class TracingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        trace = start_trace(request.META.get('HTTP_TRACEPARENT'))
+        if trace is None:
+            return self.get_response(request)
+
+        token = current_trace.set(trace)
+        try:
+            with execute_wrapper(db_tracing_wrapper), span(
+                request.method, SPAN_KIND_SERVER, **{
+                    'http.method': request.method,
+                    'http.target': request.get_full_path(),
+                }
+            ) as root:
+                response = self.get_response(request)
+                route = get_route_name(request)
+                root.name = f'{request.method} {route}'
+                root.attributes['http.route'] = route
+                root.attributes['http.status_code'] = response.status_code
+        finally:
+            current_trace.reset(token)
+        exporter.export(trace)
+        response['X-Trace-Id'] = trace.trace_id
+        return response
+
+
+class AccessLogMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not access_log.enabled:
+            return self.get_response(request)
+
+        started = perf_counter()
+        response = self.get_response(request)
+        user = getattr(request, 'user', None)
+        access_log.log({
+            'time': round(time(), 3),
+            'method': request.method,
+            'path': request.path,
+            'route': get_route_name(request),
+            'user_id': user.pk if user is not None else None,
+            'status': response.status_code,
+            'latency_ms': round((perf_counter() - started) * 1000, 3),
+            'queries': getattr(request, 'query_count', None),
+            'bytes': None if response.streaming else len(response.content),
+        })
+        return response
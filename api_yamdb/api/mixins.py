@@ -1,4 +1,17 @@
+from django.core.cache import cache
 from rest_framework import mixins, viewsets
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from api_yamdb.settings import (COMPILED_SERIALIZERS_ENABLED,
+                                NESTED_PAGE_CACHE_TIMEOUT)
+
+from api.cache import (get_cached, get_version, make_key, query_params_key,
+                       versioned_cache_enabled)
+from api.compiled import PK_COLUMN, get_compiled_serializer
+from api.renderers import FastJSONRenderer
+from api.shadow import shadow_verifier
+from api.utils import get_sparse_fields
 
 
 class ListCreateDeleteViewSet(
@@ -8,3 +21,134 @@ class ListCreateDeleteViewSet(
     mixins.DestroyModelMixin,
 ):
     pass
+
+
+class SparseFieldsViewSetMixin:
+    def get_serializer_sources(self):
+        fields, omit = get_sparse_fields(self.request)
+        if fields is None and not omit:
+            return None
+        serializer = self.get_serializer()
+        return {
+            field.source.split('.')[0]
+            for field in serializer.fields.values()
+        }
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        sources = self.get_serializer_sources()
+        if sources is None:
+            return queryset
+        deferred = [
+            field.name for field in queryset.model._meta.concrete_fields
+            if not field.is_relation
+            and not field.primary_key
+            and field.name not in sources
+        ]
+        return queryset.defer(*deferred)
+
+
+class CompiledListMixin:
+    def get_compiled_serializer(self):
+        if not COMPILED_SERIALIZERS_ENABLED:
+            return None
+        serializer_class = self.get_serializer_class()
+        declared = getattr(serializer_class.Meta, 'fields', None)
+        if not isinstance(declared, (list, tuple)):
+            return None
+        fields, omit = get_sparse_fields(self.request)
+        names = tuple(
+            name for name in declared
+            if (fields is None or name in fields) and name not in omit
+        )
+        return get_compiled_serializer(
+            serializer_class, names, self.get_serializer
+        )
+
+    def get_reference_data(self, pk=None):
+        queryset = self.filter_queryset(self.get_queryset())
+        if pk is not None:
+            return self.get_serializer(queryset.get(pk=pk)).data
+        if self.paginator is not None:
+            # A fresh paginator keeps the view's own page untouched.
+            queryset = type(self.paginator)().paginate_queryset(
+                queryset, self.request, view=self
+            )
+        return self.get_serializer(queryset, many=True).data
+
+    def shadow_check(self, data, pk=None, raw=False):
+        if not shadow_verifier.should_check():
+            return
+        name = f'{self.basename}-{self.action}'
+
+        def reference():
+            data = self.get_reference_data(pk)
+            return FastJSONRenderer().encode(data) if raw else data
+
+        shadow_verifier.submit(
+            f'{name}:documents' if raw else name, data, reference
+        )
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = compiled.values(queryset)
+        page = self.paginate_queryset(rows)
+        rows = list(rows) if page is None else page
+        data = compiled.serialize(rows, queryset)
+        self.shadow_check(data)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class CompiledRetrieveMixin(CompiledListMixin):
+    def retrieve(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().retrieve(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        model = queryset.model
+        attnames = [field.attname for field in model._meta.concrete_fields]
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            compiled.values(queryset, *attnames),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(
+            request, model(**{name: row[name] for name in attnames})
+        )
+        data = compiled.serialize([row], queryset)[0]
+        self.shadow_check(data, row[PK_COLUMN])
+        return Response(data)
+
+
+class NestedPageCacheMixin:
+    """Caches list pages under the versions of their parent objects.
+
+    ``get_page_versions`` names the version counters the page depends on;
+    bumping any of them makes the cached pages of that parent unreachable.
+    """
+
+    page_cache_name = None
+
+    def get_page_versions(self):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        if not versioned_cache_enabled():
+            return super().list(request, *args, **kwargs)
+        key = make_key(
+            self.page_cache_name,
+            *(get_version(name) for name in self.get_page_versions()),
+            request.build_absolute_uri(request.path),
+            query_params_key(request.query_params),
+        )
+        data = get_cached(key, self.page_cache_name)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, NESTED_PAGE_CACHE_TIMEOUT)
+        return response
@@ -0,0 +1,146 @@
+import logging
+import math
+import re
+import threading
+from collections import deque
+from functools import lru_cache
+from time import perf_counter
+
+from api_yamdb.settings import (QUERY_STATS_MAX_FINGERPRINTS,
+                                QUERY_STATS_SAMPLES, SLOW_QUERY_LOG_SIZE,
+                                SLOW_QUERY_THRESHOLD_MS)
+
+logger = logging.getLogger('api.slow_queries')
+
+re_string = re.compile(r"'(?:[^']|'')*'")
+re_number = re.compile(r'\b\d+(?:\.\d+)?\b')
+re_in_list = re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)')
+re_whitespace = re.compile(r'\s+')
+
+EXPLAIN_PREFIXES = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+    'mysql': 'EXPLAIN ',
+}
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    sql = re_string.sub('?', sql)
+    sql = re_number.sub('?', sql)
+    sql = re_in_list.sub('(...)', sql)
+    return re_whitespace.sub(' ', sql).strip()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+class QueryStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.fingerprints = {}
+        self.slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+
+    def record(self, sql, duration):
+        key = fingerprint(sql)
+        with self.lock:
+            stats = self.fingerprints.get(key)
+            if stats is None:
+                if len(self.fingerprints) >= QUERY_STATS_MAX_FINGERPRINTS:
+                    return
+                stats = self.fingerprints[key] = {
+                    'count': 0,
+                    'total': 0,
+                    'samples': deque(maxlen=QUERY_STATS_SAMPLES),
+                }
+            stats['count'] += 1
+            stats['total'] += duration
+            stats['samples'].append(duration)
+        return key
+
+    def add_slow_query(self, entry):
+        with self.lock:
+            self.slow_queries.append(entry)
+
+    def summary(self):
+        with self.lock:
+            fingerprints = [
+                {
+                    'fingerprint': key,
+                    'count': stats['count'],
+                    'total_ms': round(stats['total'] * 1000, 3),
+                    'avg_ms': round(
+                        stats['total'] / stats['count'] * 1000, 3
+                    ),
+                    'p95_ms': round(
+                        percentile(stats['samples'], 0.95) * 1000, 3
+                    ),
+                }
+                for key, stats in self.fingerprints.items()
+            ]
+            slow_queries = list(self.slow_queries)
+        fingerprints.sort(key=lambda item: item['total_ms'], reverse=True)
+        return {'fingerprints': fingerprints, 'slow_queries': slow_queries}
+
+    def reset(self):
+        with self.lock:
+            self.fingerprints.clear()
+            self.slow_queries.clear()
+
+
+query_stats = QueryStats()
+explaining = threading.local()
+
+
+def explain(connection, sql, params):
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    explaining.active = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return [list(row) for row in cursor.fetchall()]
+    except Exception as exc:
+        return [f'EXPLAIN failed: {exc}']
+    finally:
+        explaining.active = False
+
+
+class QueryStatsWrapper:
+    def __init__(self, request):
+        self.request = request
+
+    def view_name(self):
+        match = getattr(self.request, 'resolver_match', None)
+        return match.view_name if match else None
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(explaining, 'active', False):
+            return execute(sql, params, many, context)
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - started
+            key = query_stats.record(sql, duration)
+            if duration * 1000 >= SLOW_QUERY_THRESHOLD_MS and not many:
+                self.log_slow_query(
+                    context['connection'], sql, params, duration, key
+                )
+
+    def log_slow_query(self, connection, sql, params, duration, key):
+        entry = {
+            'fingerprint': key or fingerprint(sql),
+            'sql': sql,
+            'duration_ms': round(duration * 1000, 3),
+            'view': self.view_name(),
+            'plan': explain(connection, sql, params),
+        }
+        query_stats.add_slow_query(entry)
+        logger.warning('slow query', extra=entry)
@@ -0,0 +1,126 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from api_yamdb.settings import (PROFILES_DIR, SAMPLING_PROFILER_HZ,
+                                SAMPLING_PROFILER_MAX_OVERHEAD,
+                                SAMPLING_PROFILER_WINDOW)
+
+
+def frame_label(code, module):
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f'{module}:{name}'
+
+
+class StackSampler(threading.Thread):
+    def __init__(self, hz=SAMPLING_PROFILER_HZ,
+                 window=SAMPLING_PROFILER_WINDOW,
+                 max_overhead=SAMPLING_PROFILER_MAX_OVERHEAD,
+                 dump_dir=PROFILES_DIR):
+        super().__init__(name='stack-sampler', daemon=True)
+        self.interval = 1 / hz
+        self.window = window
+        self.max_overhead = max_overhead
+        self.dump_dir = dump_dir
+        self.lock = threading.Lock()
+        self.stacks = Counter()
+        self.last_window = Counter()
+        self.samples = 0
+        self.sampling_time = 0
+        self.window_started = time.monotonic()
+        self.labels = {}
+        self.stopped = threading.Event()
+
+    def label(self, frame):
+        code = frame.f_code
+        label = self.labels.get(code)
+        if label is None:
+            label = self.labels[code] = frame_label(
+                code, frame.f_globals.get('__name__', '?')
+            )
+        return label
+
+    def sample(self):
+        own_id = self.ident
+        collected = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self.label(frame))
+                frame = frame.f_back
+            collected.append(';'.join(reversed(stack)))
+        with self.lock:
+            self.stacks.update(collected)
+            self.samples += 1
+
+    def run(self):
+        while not self.stopped.is_set():
+            started = time.perf_counter()
+            self.sample()
+            elapsed = time.perf_counter() - started
+            self.sampling_time += elapsed
+            if time.monotonic() - self.window_started >= self.window:
+                self.rotate()
+            # Sleep long enough to keep sampling under the overhead budget.
+            self.stopped.wait(
+                max(self.interval, elapsed / self.max_overhead) - elapsed
+            )
+
+    def rotate(self):
+        with self.lock:
+            self.last_window = self.stacks
+            self.stacks = Counter()
+            self.window_started = time.monotonic()
+        if self.dump_dir is not None:
+            self.dump(self.last_window)
+
+    def dump(self, stacks):
+        self.dump_dir.mkdir(parents=True, exist_ok=True)
+        path = self.dump_dir / '{}-{}.collapsed'.format(
+            time.strftime('%Y%m%d-%H%M%S'), os.getpid()
+        )
+        path.write_text(format_collapsed(stacks))
+
+    def collapsed(self, window='current'):
+        with self.lock:
+            stacks = self.stacks if window == 'current' else self.last_window
+            return format_collapsed(stacks)
+
+    def stats(self):
+        return {
+            'samples': self.samples,
+            'sampling_seconds': round(self.sampling_time, 3),
+            'window_seconds': self.window,
+        }
+
+    def stop(self):
+        self.stopped.set()
+
+
+def format_collapsed(stacks):
+    return ''.join(
+        f'{stack} {count}\n' for stack, count in stacks.most_common()
+    )
+
+
+sampler = None
+
+
+def start_sampler():
+    global sampler
+    if sampler is not None and sampler.is_alive():
+        return sampler
+    sampler = StackSampler()
+    sampler.start()
+    return sampler
+
+
+def restart_after_fork():
+    global sampler
+    if sampler is not None:
+        sampler = None
+        start_sampler()
@@ -11,11 +11,31 @@ from api_yamdb.settings import (MAX_SLUG_LENGTH,
                                 MAX_EMAIL_LENGTH, MAX_USERNAME_LENGTH,
                                 MAX_NAME_LENGTH, USER_OWN_URL)
 
+from api.timing import TimedSerializerMixin
+from api.tracing import TracedSerializerMixin
+from api.utils import get_sparse_fields
+
 
 pattern_username = re.compile(r'^[\w.@+-]+\Z')
 pattern_slug = re.compile(r'^[-a-zA-Z0-9_]+$')
 
 
+class SparseFieldsSerializerMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, omit = get_sparse_fields(self.context.get('request'))
+        if fields is None and not omit:
+            return
+        for name in list(self.fields):
+            if (fields is not None and name not in fields) or name in omit:
+                self.fields.pop(name)
+
+
+class BaseModelSerializer(SparseFieldsSerializerMixin, TimedSerializerMixin,
+                          TracedSerializerMixin, serializers.ModelSerializer):
+    pass
+
+
 class SignupUserSerializer(serializers.ModelSerializer):
     username = serializers.CharField()
     email = serializers.EmailField()
@@ -47,7 +67,7 @@ class SignupUserSerializer(serializers.ModelSerializer):
         fields = ('username', 'email', )
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(BaseModelSerializer):
     slug = serializers.SlugField(
         validators=[
             UniqueValidator(queryset=Category.objects.all())
@@ -76,7 +96,7 @@ class CategorySerializer(serializers.ModelSerializer):
         }
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(BaseModelSerializer):
     slug = serializers.SlugField(
         validators=[
             UniqueValidator(queryset=Genre.objects.all())
@@ -105,7 +125,7 @@ class GenreSerializer(serializers.ModelSerializer):
         }
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(BaseModelSerializer):
     genre = serializers.SlugRelatedField(
         slug_field='slug', many=True, queryset=Genre.objects.all()
     )
@@ -130,7 +150,7 @@ class TitleSerializer(serializers.ModelSerializer):
         }
 
 
-class ReadOnlyTitleSerializer(serializers.ModelSerializer):
+class ReadOnlyTitleSerializer(BaseModelSerializer):
     genre = GenreSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
     rating = serializers.IntegerField(read_only=True)
@@ -142,7 +162,7 @@ class ReadOnlyTitleSerializer(serializers.ModelSerializer):
         )
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(BaseModelSerializer):
     title = serializers.SlugRelatedField(
         slug_field='name',
         read_only=True,
@@ -169,7 +189,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date', 'title', )
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(BaseModelSerializer):
     title = serializers.SlugRelatedField(slug_field='name', read_only=True,)
     review = serializers.SlugRelatedField(slug_field='id', read_only=True,)
     author = serializers.SlugRelatedField(
@@ -183,7 +203,7 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'review', 'text', 'pub_date', 'author', 'title', )
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(BaseModelSerializer):
     username = serializers.CharField(validators=[
         UniqueValidator(queryset=User.objects.all()),
     ])
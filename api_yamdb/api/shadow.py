@@ -0,0 +1,149 @@
+import json
+import os
+import random
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.db import connections
+
+from api_yamdb.settings import (SHADOW_MAX_DIFFS, SHADOW_MAX_PENDING,
+                                SHADOW_MAX_SAMPLES, SHADOW_SAMPLE_RATE,
+                                SHADOW_WORKERS)
+
+from api.metrics import registry
+
+MATCH = 'match'
+MISMATCH = 'mismatch'
+ERROR = 'error'
+DROPPED = 'dropped'
+
+
+def find_differences(expected, actual, path='$', limit=SHADOW_MAX_DIFFS):
+    differences = []
+
+    def walk(expected, actual, path):
+        if len(differences) >= limit:
+            return
+        if isinstance(expected, dict) and isinstance(actual, dict):
+            if list(expected) != list(actual):
+                differences.append({
+                    'path': path,
+                    'expected': list(expected),
+                    'actual': list(actual),
+                })
+                return
+            for key in expected:
+                walk(expected[key], actual[key], f'{path}.{key}')
+        elif isinstance(expected, list) and isinstance(actual, list):
+            if len(expected) != len(actual):
+                differences.append({
+                    'path': f'{path}.length',
+                    'expected': len(expected),
+                    'actual': len(actual),
+                })
+                return
+            for index, (left, right) in enumerate(zip(expected, actual)):
+                walk(left, right, f'{path}[{index}]')
+        elif type(expected) is not type(actual) or expected != actual:
+            differences.append({
+                'path': path, 'expected': repr(expected),
+                'actual': repr(actual),
+            })
+
+    walk(expected, actual, path)
+    return differences
+
+
+class ShadowVerifier:
+    def __init__(self, sample_rate=SHADOW_SAMPLE_RATE, workers=SHADOW_WORKERS,
+                 max_pending=SHADOW_MAX_PENDING, samples=SHADOW_MAX_SAMPLES):
+        self.sample_rate = sample_rate
+        self.workers = workers
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.results = {}
+        self.samples = deque(maxlen=samples)
+        self.pending = set()
+        self.pid = None
+        self.executor = None
+
+    def should_check(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def ensure_started(self):
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.executor = ThreadPoolExecutor(
+                self.workers, thread_name_prefix='shadow-verifier'
+            )
+            self.pending = set()
+            self.pid = os.getpid()
+
+    def submit(self, name, actual, reference):
+        self.ensure_started()
+        with self.lock:
+            if len(self.pending) >= self.max_pending:
+                self.count(name, DROPPED)
+                return
+            future = self.executor.submit(self.check, name, actual, reference)
+            self.pending.add(future)
+        future.add_done_callback(self.discard)
+
+    def discard(self, future):
+        with self.lock:
+            self.pending.discard(future)
+
+    def check(self, name, actual, reference):
+        try:
+            expected = reference()
+        except Exception as error:
+            with self.lock:
+                self.count(name, ERROR)
+                self.samples.append({'name': name, 'error': repr(error)})
+            return
+        finally:
+            connections.close_all()
+        if isinstance(actual, bytes):
+            actual, expected = json.loads(actual), json.loads(expected)
+        differences = find_differences(expected, actual)
+        with self.lock:
+            self.count(name, MISMATCH if differences else MATCH)
+            if differences:
+                self.samples.append({
+                    'name': name, 'differences': differences,
+                })
+
+    def count(self, name, result):
+        self.results.setdefault(name, Counter())[result] += 1
+        registry.inc('yamdb_shadow_checks_total', {
+            'name': name, 'result': result,
+        })
+
+    def wait(self, timeout=None):
+        with self.lock:
+            pending = list(self.pending)
+        wait(pending, timeout)
+
+    def summary(self):
+        with self.lock:
+            return {
+                'sample_rate': self.sample_rate,
+                'pending': len(self.pending),
+                'checks': {
+                    name: dict(results)
+                    for name, results in self.results.items()
+                },
+                'samples': list(self.samples),
+            }
+
+    def reset(self):
+        with self.lock:
+            self.results.clear()
+            self.samples.clear()
+
+
+shadow_verifier = ShadowVerifier()
@@ -0,0 +1,114 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+
+from api.cache import bump_version
+from api.documents import mark_dirty
+from api.fragments import fragments_version_name
+
+CATALOG_VERSION = 'catalog'
+
+
+def title_version_name(title_id):
+    return f'title:{title_id}'
+
+
+def reviews_version_name(title_id):
+    return f'reviews:{title_id}'
+
+
+def comments_version_name(review_id):
+    return f'comments:{review_id}'
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def catalog_changed(sender, **kwargs):
+    bump_version(CATALOG_VERSION)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_version(CATALOG_VERSION)
+
+
+# QuerySet.update() and bulk_create()/bulk_update() send no signals: code
+# that changes these models in bulk has to bump the versions itself.
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def fragment_changed(sender, created=False, **kwargs):
+    if not created:
+        bump_version(fragments_version_name(sender))
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    mark_dirty([instance.pk])
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def title_child_changed(sender, instance, **kwargs):
+    mark_dirty([instance.title_id])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_documents_changed(sender, instance, action, reverse,
+                                   pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        mark_dirty(
+            Title.objects.filter(genre=instance).values_list('pk', flat=True)
+        )
+    elif action.startswith('post_'):
+        mark_dirty((pk_set or ()) if reverse else [instance.pk])
+
+
+@receiver(post_save, sender=Genre)
+def genre_saved(sender, instance, created, **kwargs):
+    if not created:
+        mark_dirty(
+            Title.objects.filter(genre=instance).values_list('pk', flat=True)
+        )
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        mark_dirty(instance.titles.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_page_changed(sender, instance, **kwargs):
+    bump_version(title_version_name(instance.pk))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_page_changed(sender, instance, **kwargs):
+    bump_version(reviews_version_name(instance.title_id))
+
+
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_page_changed(sender, instance, **kwargs):
+    review_id = instance.pk if sender is Review else instance.review_id
+    bump_version(comments_version_name(review_id))
@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+current_timings = ContextVar('current_timings', default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = perf_counter()
+        self.durations = {}
+        self.db_queries = 0
+        self.serializing = False
+
+    def add(self, name, duration):
+        self.durations[name] = self.durations.get(name, 0) + duration
+
+    def total(self):
+        return perf_counter() - self.started
+
+    def as_fields(self):
+        fields = {
+            f'{name}_ms': round(duration * 1000, 3)
+            for name, duration in self.durations.items()
+        }
+        fields['db_queries'] = self.db_queries
+        fields['total_ms'] = round(self.total() * 1000, 3)
+        return fields
+
+    def server_timing(self):
+        metrics = []
+        for name, duration in self.durations.items():
+            metric = f'{name};dur={duration * 1000:.3f}'
+            if name == 'db':
+                metric += f';desc="{self.db_queries} queries"'
+            metrics.append(metric)
+        metrics.append(f'total;dur={self.total() * 1000:.3f}')
+        return ', '.join(metrics)
+
+
+@contextmanager
+def timed(name):
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, perf_counter() - started)
+
+
+def db_timing_wrapper(execute, sql, params, many, context):
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add('db', perf_counter() - started)
+        timings.db_queries += 1
+
+
+class TimedSerializerMixin:
+    def to_representation(self, instance):
+        timings = current_timings.get()
+        if timings is None or timings.serializing:
+            return super().to_representation(instance)
+        timings.serializing = True
+        started = perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            timings.serializing = False
+            timings.add('serializer', perf_counter() - started)
@@ -0,0 +1,227 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from api_yamdb.settings import (TRACING_EXPORT_PATH, TRACING_SAMPLE_RATE,
+                                TRACING_SERVICE_NAME,
+                                TRACING_TRUST_REMOTE_SAMPLING)
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+current_trace = ContextVar('current_trace', default=None)
+current_span = ContextVar('current_span', default=None)
+
+TRACEPARENT_RE = re.compile(
+    r'(?P<version>[0-9a-f]{2})-(?P<trace_id>[0-9a-f]{32})-'
+    r'(?P<parent_id>[0-9a-f]{16})-(?P<flags>[0-9a-f]{2})'
+)
+
+
+def random_id(size):
+    return os.urandom(size).hex()
+
+
+def otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def otlp_attributes(attributes):
+    return [
+        {'key': key, 'value': otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+class Span:
+    def __init__(self, trace, name, parent=None, kind=SPAN_KIND_INTERNAL,
+                 attributes=None):
+        self.trace = trace
+        self.name = name
+        self.span_id = random_id(8)
+        self.parent_id = parent.span_id if parent else trace.parent_id
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.status = STATUS_OK
+        self.start = time.time_ns()
+        self.end = None
+
+    def finish(self, error=None):
+        self.end = time.time_ns()
+        if error is not None:
+            self.status = STATUS_ERROR
+            self.attributes['exception.type'] = type(error).__name__
+        self.trace.spans.append(self)
+
+    def as_otlp(self):
+        data = {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(self.end),
+            'attributes': otlp_attributes(self.attributes),
+            'status': {'code': self.status},
+        }
+        if self.parent_id:
+            data['parentSpanId'] = self.parent_id
+        return data
+
+
+class Trace:
+    def __init__(self, trace_id=None, parent_id=None):
+        self.trace_id = trace_id or random_id(16)
+        self.parent_id = parent_id
+        self.spans = []
+
+    def as_otlp(self):
+        return {'resourceSpans': [{
+            'resource': {'attributes': otlp_attributes({
+                'service.name': TRACING_SERVICE_NAME,
+                'process.pid': os.getpid(),
+            })},
+            'scopeSpans': [{
+                'scope': {'name': 'api.tracing'},
+                'spans': [span.as_otlp() for span in self.spans],
+            }],
+        }]}
+
+
+def parse_traceparent(header):
+    match = TRACEPARENT_RE.fullmatch(header.strip()) if header else None
+    if (
+        match is None
+        or match['version'] == 'ff'
+        or not match['trace_id'].strip('0')
+        or not match['parent_id'].strip('0')
+    ):
+        return None
+    sampled = int(match['flags'], 16) & 1 == 1
+    return match['trace_id'], match['parent_id'], sampled
+
+
+def start_trace(traceparent=None):
+    """Start a trace for a request, continuing an incoming traceparent.
+
+    The sampled flag of the caller is only honoured with
+    TRACING_TRUST_REMOTE_SAMPLING; otherwise the local rate decides and the
+    incoming ids are kept for propagation.
+    """
+    trace_id, parent_id, sampled = (
+        parse_traceparent(traceparent) or (None, None, False)
+    )
+    if TRACING_TRUST_REMOTE_SAMPLING and trace_id is not None:
+        return Trace(trace_id, parent_id) if sampled else None
+    if TRACING_SAMPLE_RATE and random.random() < TRACING_SAMPLE_RATE:
+        return Trace(trace_id, parent_id)
+    return None
+
+
+@contextmanager
+def span(name, kind=SPAN_KIND_INTERNAL, **attributes):
+    trace = current_trace.get()
+    if trace is None:
+        yield None
+        return
+    new_span = Span(trace, name, current_span.get(), kind, attributes)
+    token = current_span.set(new_span)
+    try:
+        yield new_span
+    except BaseException as error:
+        new_span.finish(error)
+        raise
+    else:
+        new_span.finish()
+    finally:
+        current_span.reset(token)
+
+
+def traced(name):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            parent = current_span.get()
+            if parent is None or parent.name == name:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def db_tracing_wrapper(execute, sql, params, many, context):
+    with span('db.query', SPAN_KIND_CLIENT, **{
+        'db.system': context['connection'].vendor,
+        'db.statement': sql,
+    }):
+        return execute(sql, params, many, context)
+
+
+class FileSpanExporter:
+    def __init__(self, path=TRACING_EXPORT_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def export(self, trace):
+        line = json.dumps(trace.as_otlp(), ensure_ascii=False) + '\n'
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as export_file:
+                export_file.write(line)
+
+
+exporter = FileSpanExporter()
+
+
+class TracedSerializerMixin:
+    def to_representation(self, instance):
+        parent = current_span.get()
+        if parent is None or parent.name == 'serializer':
+            return super().to_representation(instance)
+        with span('serializer', **{'serializer.class': type(self).__name__}):
+            return super().to_representation(instance)
+
+
+class TracedViewMixin:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'get_queryset' in cls.__dict__:
+            cls.get_queryset = traced('get_queryset')(cls.get_queryset)
+
+    def perform_authentication(self, request):
+        with span('authentication'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with span('permissions') as permissions_span:
+            if permissions_span is not None:
+                permissions_span.attributes['permission.classes'] = ','.join(
+                    type(permission).__name__
+                    for permission in self.get_permissions()
+                )
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with span('object_permissions'):
+            super().check_object_permissions(request, obj)
+
+    @traced('get_queryset')
+    def get_queryset(self):
+        return super().get_queryset()
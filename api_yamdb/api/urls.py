@@ -3,23 +3,49 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (CategoriesViewSet, CommentsViewSet, GenresViewSet,
                     ReviewsViewSet, TitlesViewSet, UsersViewSet,
-                    SignUpView, SendTokenView)
+                    SignUpView, SendTokenView, QueryStatsView,
+                    SamplingProfileView, MemoryStatsView, ShadowStatsView,
+                    metrics)
 
 router = DefaultRouter()
 
-router.register(r'categories', CategoriesViewSet)
-router.register(r'genres', GenresViewSet)
-router.register(r'titles', TitlesViewSet)
-router.register(r'titles/(?P<title_id>\d+)/reviews', ReviewsViewSet)
+router.register(r'categories', CategoriesViewSet, basename='categories')
+router.register(r'genres', GenresViewSet, basename='genres')
+router.register(r'titles', TitlesViewSet, basename='titles')
+router.register(
+    r'titles/(?P<title_id>\d+)/reviews', ReviewsViewSet, basename='reviews'
+)
 router.register(
     r'titles/(?P<title_id>\d+)/reviews/(?P<review_id>\d+)/comments',
-    CommentsViewSet
+    CommentsViewSet,
+    basename='comments'
 )
-router.register(r'users', UsersViewSet)
+router.register(r'users', UsersViewSet, basename='users')
 
 
 urlpatterns = [
     path('api/v1/auth/signup/', SignUpView.as_view(), name='signup'),
     path('api/v1/auth/token/', SendTokenView.as_view(), name='send_token'),
+    path(
+        'api/v1/debug/queries/',
+        QueryStatsView.as_view(),
+        name='query_stats'
+    ),
+    path(
+        'api/v1/debug/sampling/',
+        SamplingProfileView.as_view(),
+        name='sampling_profile'
+    ),
+    path(
+        'api/v1/debug/memory/',
+        MemoryStatsView.as_view(),
+        name='memory_stats'
+    ),
+    path(
+        'api/v1/debug/shadow/',
+        ShadowStatsView.as_view(),
+        name='shadow_stats'
+    ),
     path('api/v1/', include(router.urls)),
+    path('metrics', metrics, name='metrics'),
 ]
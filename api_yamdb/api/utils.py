@@ -0,0 +1,20 @@
+from rest_framework import permissions
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def split_param(value):
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def get_sparse_fields(request):
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None, set()
+    params = getattr(request, 'query_params', request.GET)
+    fields = params.get(FIELDS_PARAM)
+    omit = params.get(OMIT_PARAM)
+    return (
+        split_param(fields) if fields else None,
+        split_param(omit) if omit else set(),
+    )
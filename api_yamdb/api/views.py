@@ -1,10 +1,15 @@
+from hmac import compare_digest
+
 from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
 from django.core.mail import send_mail
 from django.db import IntegrityError
 from django.db.models import Avg
+from django.http import HttpResponse, HttpResponseForbidden
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
@@ -13,15 +18,41 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import AccessToken
 
 from reviews.models import Category, Comment, Genre, Review, Title, User
-from api_yamdb.settings import FROM_EMAIL
+from api_yamdb.settings import (FACETS_CACHE_TIMEOUT, FROM_EMAIL,
+                                MATERIALIZED_TITLES_ENABLED,
+                                METRICS_ALLOWED_IPS, METRICS_TOKEN,
+                                TITLES_BATCH_MAX_SIZE)
 
+from api import sampling
+from api.cache import (
+    get_cached,
+    get_version,
+    make_key,
+    query_params_key,
+    versioned_cache_enabled
+)
+from api.documents import complete_documents
+from api.expand import expand_title, get_expand_params
+from api.facets import get_title_facets
 from api.filters import TitleFilter
-from api.mixins import ListCreateDeleteViewSet
+from api.fragments import fragments_version_name
+from api.memory import memory_stats
+from api.metrics import registry
+from api.mixins import (
+    CompiledListMixin,
+    CompiledRetrieveMixin,
+    ListCreateDeleteViewSet,
+    NestedPageCacheMixin,
+    SparseFieldsViewSetMixin
+)
 from api.permissions import (
     IsAdminOrAuthorOrModeratorPermissions,
     IsAdminPermissions,
     IsOnlyAdminPermissions
 )
+from api.queries import query_stats
+from api.renderers import FastJSONRenderer, RawJSON
+from api.shadow import shadow_verifier
 from api.serializers import (
     CategorySerializer,
     CommentSerializer,
@@ -33,9 +64,17 @@ from api.serializers import (
     UserSerializer,
     UserTokenSerializer
 )
+from api.signals import (
+    CATALOG_VERSION,
+    comments_version_name,
+    reviews_version_name,
+    title_version_name
+)
+from api.tracing import TracedViewMixin
+from api.utils import get_sparse_fields
 
 
-class SignUpView(APIView):
+class SignUpView(TracedViewMixin, APIView):
     permission_classes = (permissions.AllowAny, )
     http_method_names = ('post', )
 
@@ -66,7 +105,7 @@ class SignUpView(APIView):
         return Response(serializer.data, status.HTTP_200_OK)
 
 
-class SendTokenView(APIView):
+class SendTokenView(TracedViewMixin, APIView):
     permission_classes = (permissions.AllowAny, )
     http_method_names = ('post', )
 
@@ -90,8 +129,67 @@ class SendTokenView(APIView):
         return Response(return_data, return_status)
 
 
-class CategoriesViewSet(ListCreateDeleteViewSet):
-    queryset = Category.objects.all()
+class QueryStatsView(TracedViewMixin, APIView):
+    permission_classes = (IsAuthenticated, IsOnlyAdminPermissions,)
+    http_method_names = ('get', 'delete', )
+
+    def get(self, request):
+        return Response(query_stats.summary())
+
+    def delete(self, request):
+        query_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class MemoryStatsView(TracedViewMixin, APIView):
+    permission_classes = (IsAuthenticated, IsOnlyAdminPermissions,)
+    http_method_names = ('get', 'delete', )
+
+    def get(self, request):
+        return Response(memory_stats.summary())
+
+    def delete(self, request):
+        memory_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ShadowStatsView(TracedViewMixin, APIView):
+    permission_classes = (IsAuthenticated, IsOnlyAdminPermissions,)
+    http_method_names = ('get', 'delete', )
+
+    def get(self, request):
+        return Response(shadow_verifier.summary())
+
+    def delete(self, request):
+        shadow_verifier.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class SamplingProfileView(TracedViewMixin, APIView):
+    permission_classes = (IsAuthenticated, IsOnlyAdminPermissions,)
+    http_method_names = ('get', )
+
+    def get(self, request):
+        sampler = sampling.sampler
+        if sampler is None:
+            return Response(
+                'Профилировщик не запущен', status.HTTP_404_NOT_FOUND
+            )
+        window = request.query_params.get('window', 'current')
+        response = HttpResponse(
+            sampler.collapsed(window),
+            content_type='text/plain; charset=utf-8'
+        )
+        for name, value in sampler.stats().items():
+            response[f'X-Sampler-{name.replace("_", "-").title()}'] = value
+        return response
+
+
+class CategoriesViewSet(
+    TracedViewMixin, SparseFieldsViewSetMixin, CompiledListMixin,
+    ListCreateDeleteViewSet
+):
+    queryset = Category.objects.order_by('id')
     serializer_class = CategorySerializer
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
@@ -99,8 +197,11 @@ class CategoriesViewSet(ListCreateDeleteViewSet):
     lookup_field = "slug"
 
 
-class GenresViewSet(ListCreateDeleteViewSet):
-    queryset = Genre.objects.all()
+class GenresViewSet(
+    TracedViewMixin, SparseFieldsViewSetMixin, CompiledListMixin,
+    ListCreateDeleteViewSet
+):
+    queryset = Genre.objects.order_by('id')
     serializer_class = GenreSerializer
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
@@ -108,8 +209,11 @@ class GenresViewSet(ListCreateDeleteViewSet):
     lookup_field = "slug"
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(rating=Avg("reviews__score"))
+class TitlesViewSet(
+    TracedViewMixin, SparseFieldsViewSetMixin, CompiledRetrieveMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Title.objects.order_by('id')
     serializer_class = TitleSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = TitleFilter
@@ -117,20 +221,142 @@ class TitlesViewSet(viewsets.ModelViewSet):
     permission_classes = (IsAdminPermissions, )
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve',):
+        if self.action in ('list', 'retrieve', 'batch',):
             return ReadOnlyTitleSerializer
         return self.serializer_class
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        sources = self.get_serializer_sources()
+        if sources is None or 'rating' in sources:
+            queryset = queryset.annotate(rating=Avg("reviews__score"))
+        if sources is None or 'category' in sources:
+            queryset = queryset.select_related('category')
+        if sources is None or 'genre' in sources:
+            queryset = queryset.prefetch_related('genre')
+        return queryset
+
+    def use_documents(self):
+        if not MATERIALIZED_TITLES_ENABLED:
+            return False
+        renderer = self.request.accepted_renderer
+        fields, omit = get_sparse_fields(self.request)
+        return (
+            isinstance(renderer, FastJSONRenderer)
+            and renderer.get_indent(self.request.accepted_media_type, {})
+            is None
+            and fields is None
+            and not omit
+        )
 
-class ReviewsViewSet(viewsets.ModelViewSet):
-    queryset = Review.objects.all()
+    def list(self, request, *args, **kwargs):
+        if not self.use_documents():
+            return super().list(request, *args, **kwargs)
+        rows = self.filter_queryset(Title.objects.order_by('id')).values_list(
+            'pk', 'document'
+        ).distinct()
+        page = self.paginate_queryset(rows)
+        rows = list(rows) if page is None else page
+        results = b'[' + ','.join(complete_documents(rows)).encode() + b']'
+        self.shadow_check(results, raw=True)
+        if page is None:
+            return Response(RawJSON(results))
+        envelope = FastJSONRenderer().encode(
+            self.get_paginated_response([]).data
+        )
+        return Response(RawJSON(envelope[:-len(b'[]}')] + results + b'}'))
+
+    def retrieve(self, request, *args, **kwargs):
+        expand, limit = get_expand_params(request)
+        if expand:
+            title = self.get_object()
+            data = self.get_serializer(title).data
+            data['reviews'] = expand_title(
+                title, expand, limit, context={'view': self}
+            )
+            return Response(data)
+        if not self.use_documents():
+            return super().retrieve(request, *args, **kwargs)
+        pk, document = get_object_or_404(
+            self.filter_queryset(Title.objects.order_by('id')).values_list(
+                'pk', 'document'
+            ).distinct(),
+            pk=self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        )
+        self.check_object_permissions(request, Title(pk=pk))
+        content = complete_documents([(pk, document)])[0].encode()
+        self.shadow_check(content, pk, raw=True)
+        return Response(RawJSON(content))
+
+    @action(detail=False, methods=('get', ), url_path='facets')
+    def facets(self, request: Request) -> Response:
+        if not versioned_cache_enabled():
+            return Response(
+                get_title_facets(self.filter_queryset(Title.objects.all()))
+            )
+        key = make_key(
+            'title-facets',
+            get_version(CATALOG_VERSION),
+            query_params_key(request.query_params),
+        )
+        data = get_cached(key, 'title-facets')
+        if data is None:
+            queryset = self.filter_queryset(Title.objects.all())
+            data = get_title_facets(queryset)
+            cache.set(key, data, FACETS_CACHE_TIMEOUT)
+        return Response(data)
+
+    @action(detail=False, methods=('get', ), url_path='batch')
+    def batch(self, request: Request) -> Response:
+        raw_ids = request.query_params.get('ids', '')
+        try:
+            ids = [int(pk) for pk in raw_ids.split(',') if pk.strip()]
+        except ValueError:
+            raise ValidationError(
+                {'ids': 'Ожидается список id через запятую'}
+            )
+        if not ids:
+            raise ValidationError({'ids': 'Не передан ни один id'})
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > TITLES_BATCH_MAX_SIZE:
+            raise ValidationError(
+                {'ids': f'Можно запросить не более {TITLES_BATCH_MAX_SIZE} '
+                        'произведений'}
+            )
+        titles = {
+            title.id: title
+            for title in self.get_queryset().filter(id__in=ids)
+        }
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in titles],
+        })
+
+
+class ReviewsViewSet(
+    TracedViewMixin, SparseFieldsViewSetMixin, NestedPageCacheMixin,
+    CompiledRetrieveMixin, viewsets.ModelViewSet
+):
+    queryset = Review.objects.order_by('id')
     serializer_class = ReviewSerializer
+    page_cache_name = 'review-page'
     permission_classes = (IsAdminOrAuthorOrModeratorPermissions,)
     http_method_names = ('get', 'post', 'head', 'patch', 'delete', )
 
     def get_queryset(self):
         title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return title.reviews.select_related('author', 'title').order_by('id')
+
+    def get_page_versions(self):
+        title_id = self.kwargs.get('title_id')
+        return (
+            title_version_name(title_id),
+            reviews_version_name(title_id),
+            fragments_version_name(User),
+        )
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get('title_id')
@@ -138,15 +364,27 @@ class ReviewsViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, title=title)
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
-    queryset = Comment.objects.all()
+class CommentsViewSet(
+    TracedViewMixin, SparseFieldsViewSetMixin, NestedPageCacheMixin,
+    CompiledRetrieveMixin, viewsets.ModelViewSet
+):
+    queryset = Comment.objects.order_by('id')
     serializer_class = CommentSerializer
+    page_cache_name = 'comment-page'
     permission_classes = (IsAdminOrAuthorOrModeratorPermissions,)
     http_method_names = ('get', 'post', 'head', 'patch', 'delete', )
 
     def get_queryset(self):
         review = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        return review.comments.all()
+        return review.comments.select_related('author', 'review').order_by(
+            'id'
+        )
+
+    def get_page_versions(self):
+        return (
+            comments_version_name(self.kwargs.get('review_id')),
+            fragments_version_name(User),
+        )
 
     def perform_create(self, serializer):
         review_id = self.kwargs.get('review_id')
@@ -155,7 +393,9 @@ class CommentsViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, review=review, )
 
 
-class UsersViewSet(viewsets.ModelViewSet):
+class UsersViewSet(
+    TracedViewMixin, SparseFieldsViewSetMixin, viewsets.ModelViewSet
+):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     filter_backends = [filters.SearchFilter]
@@ -184,3 +424,21 @@ class UsersViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
         serializer = self.get_serializer(request.user, many=False)
         return Response(serializer.data)
+
+
+def metrics_allowed(request):
+    if METRICS_TOKEN:
+        authorization = request.META.get('HTTP_AUTHORIZATION', '')
+        return compare_digest(
+            authorization.encode(), f'Bearer {METRICS_TOKEN}'.encode()
+        )
+    return request.META.get('REMOTE_ADDR') in METRICS_ALLOWED_IPS
+
+
+def metrics(request):
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
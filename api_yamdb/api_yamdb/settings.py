@@ -1,5 +1,6 @@
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -15,9 +16,59 @@ MAX_SLUG_LENGTH = 50
 MAX_USERNAME_LENGTH = 150
 USER_OWN_URL = 'me'
 FROM_EMAIL = 'xxxxxvic@yandex.ru',
+EMAIL_BACKEND = os.getenv(
+    'EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend'
+)
+
+CACHE_KEY_PREFIX = 'yamdb'
+# Version counters of the facet, fragment and page caches live in the
+# default cache, so they are only coherent when it is shared by all API
+# processes or when a single process serves the API.
+CACHE_SINGLE_PROCESS = os.getenv('CACHE_SINGLE_PROCESS', 'False') == 'True'
+FACETS_CACHE_TIMEOUT = 60 * 5
+NESTED_PAGE_CACHE_TIMEOUT = 60 * 5
+FRAGMENT_CACHE_MODELS = ('reviews.category', 'reviews.genre', 'reviews.user')
+FRAGMENT_CACHE_TIMEOUT = 60 * 60
+TITLES_BATCH_MAX_SIZE = 100
+EXPAND_DEFAULT_LIMIT = 5
+EXPAND_MAX_LIMIT = 20
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_LEVEL = 6
+COMPRESSION_CACHE_TIMEOUT = 60 * 5
+SERVER_TIMING_SAMPLE_RATE = float(os.getenv('SERVER_TIMING_SAMPLE_RATE', 0))
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+METRICS_ALLOWED_IPS = tuple(
+    ip.strip()
+    for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',')
+    if ip.strip()
+)
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 100))
+SLOW_QUERY_LOG_SIZE = 100
+QUERY_STATS_MAX_FINGERPRINTS = 1000
+QUERY_STATS_SAMPLES = 500
+PROFILES_DIR = Path(os.getenv('PROFILES_DIR', BASE_DIR / 'profiles'))
+SAMPLING_PROFILER_ENABLED = os.getenv('SAMPLING_PROFILER_ENABLED', 'False') == 'True'
+SAMPLING_PROFILER_HZ = 100
+SAMPLING_PROFILER_WINDOW = 60
+SAMPLING_PROFILER_MAX_OVERHEAD = 0.02
+MEMORY_PROFILER_SAMPLE_RATE = float(os.getenv('MEMORY_PROFILER_SAMPLE_RATE', 0))
+MEMORY_PROFILER_FRAMES = 10
+MEMORY_PROFILER_TOP = 10
+TRACING_SAMPLE_RATE = float(os.getenv('TRACING_SAMPLE_RATE', 0))
+TRACING_TRUST_REMOTE_SAMPLING = os.getenv('TRACING_TRUST_REMOTE_SAMPLING', 'False') == 'True'
+TRACING_EXPORT_PATH = Path(os.getenv('TRACING_EXPORT_PATH', BASE_DIR / 'traces' / 'spans.jsonl'))
+TRACING_SERVICE_NAME = 'api_yamdb'
+ACCESS_LOG_PATH = os.getenv('ACCESS_LOG_PATH')
+ACCESS_LOG_QUEUE_SIZE = 10000
+ACCESS_LOG_BATCH_SIZE = 500
+ACCESS_LOG_FLUSH_INTERVAL = 1
+ACCESS_LOG_MAX_BYTES = 100 * 1024 * 1024
+ACCESS_LOG_BACKUP_COUNT = 5
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv('DEBUG', 'True') == 'True'
 
 ALLOWED_HOSTS = ['*']
 
@@ -39,6 +90,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.AccessLogMiddleware',
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.TracingMiddleware',
+    'api.middleware.QueryStatsMiddleware',
+    'api.middleware.ProfilingMiddleware',
+    'api.middleware.MemoryProfilingMiddleware',
+    'api.middleware.ServerTimingMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -74,7 +133,16 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
@@ -120,10 +188,37 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'reviews.User'
 
+COMPILED_SERIALIZERS_ENABLED = (
+    os.getenv('COMPILED_SERIALIZERS_ENABLED', 'True') == 'True'
+)
+MATERIALIZED_TITLES_ENABLED = (
+    os.getenv('MATERIALIZED_TITLES_ENABLED', 'True') == 'True'
+)
+TITLE_DOCUMENTS_BATCH_SIZE = 500
+
+SHADOW_SAMPLE_RATE = float(os.getenv('SHADOW_SAMPLE_RATE', 0))
+SHADOW_WORKERS = 2
+SHADOW_MAX_PENDING = 100
+SHADOW_MAX_SAMPLES = 50
+SHADOW_MAX_DIFFS = 10
+
+MSGPACK_ENABLED = find_spec('msgpack') is not None
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        *(['api.renderers.MessagePackRenderer'] if MSGPACK_ENABLED else []),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        *(['api.parsers.MessagePackParser'] if MSGPACK_ENABLED else []),
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
 
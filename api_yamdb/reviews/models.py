@@ -61,6 +61,7 @@ class Title(models.Model):
         related_name='titles',
         null=True
     )
+    document = models.TextField(null=True, blank=True, editable=False)
 
 
 class Review(models.Model):
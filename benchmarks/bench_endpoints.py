@@ -0,0 +1,310 @@
+"""Query-count, latency and allocation regression checks per route.
+
+Seeds a throwaway database at several sizes, requests every route in
+api/urls.py and compares the query counts with benchmarks/baselines/
+endpoints.json. Fails when a route issues more queries than its baseline
+or when its query count grows with the data size.
+
+Timings depend on the machine, so the committed baseline holds no times.
+To check them, save a run with --output and pass it to a later run on the
+same machine with --compare-times; routes whose median time regresses
+beyond --time-threshold then fail as well.
+
+Usage:
+    python -m benchmarks.bench_endpoints
+    python -m benchmarks.bench_endpoints --update
+    python -m benchmarks.bench_endpoints --output before.json
+    python -m benchmarks.bench_endpoints --compare-times before.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+from benchmarks.common import ROOT_DIR, setup_django
+
+BASELINE_PATH = ROOT_DIR / 'benchmarks' / 'baselines' / 'endpoints.json'
+SIZES = {
+    'small': dict(users=20, categories=3, genres=5, titles=20, reviews=60,
+                  comments=120),
+    'large': dict(users=300, categories=10, genres=30, titles=500,
+                  reviews=5000, comments=10000),
+}
+# Differences below this many milliseconds are treated as timer noise.
+TIME_NOISE_MS = 1.0
+
+Case = namedtuple(
+    'Case', 'route method kwargs query data statuses',
+    defaults=(None, '', None, (200, 201, 204)),
+)
+
+CASES = {
+    'api-root': Case('api-root', 'get'),
+    'signup': Case('signup', 'post', data=lambda f: {
+        'username': 'bench-signup', 'email': 'bench-signup@yamdb.fake',
+    }),
+    'send_token': Case('send_token', 'post', data=lambda f: {
+        'username': f.user.username, 'confirmation_code': f.code,
+    }),
+    'query_stats': Case('query_stats', 'get'),
+    # 404 while the sampling profiler is disabled.
+    'sampling_profile': Case('sampling_profile', 'get', statuses=(200, 404)),
+    'memory_stats': Case('memory_stats', 'get'),
+    'shadow_stats': Case('shadow_stats', 'get'),
+    'metrics': Case('metrics', 'get'),
+    'categories-list': Case('categories-list', 'get'),
+    'categories-create': Case('categories-list', 'post', data=lambda f: {
+        'name': 'Бенчмарк', 'slug': 'bench',
+    }),
+    'categories-detail': Case('categories-detail', 'delete', lambda f: {
+        'slug': f.title.category.slug,
+    }),
+    'genres-list': Case('genres-list', 'get'),
+    'genres-detail': Case('genres-detail', 'delete', lambda f: {
+        'slug': f.title.genre.first().slug,
+    }),
+    'titles-list': Case('titles-list', 'get'),
+    'titles-list-fields': Case(
+        'titles-list', 'get', query='?fields=id,name,rating'
+    ),
+    'titles-batch': Case('titles-batch', 'get', query=lambda f: (
+        '?ids=' + ','.join(map(str, f.title_ids))
+    )),
+    'titles-facets': Case('titles-facets', 'get'),
+    'titles-detail': Case('titles-detail', 'get', lambda f: {
+        'pk': f.title.pk,
+    }),
+    'titles-detail-expand': Case('titles-detail', 'get', lambda f: {
+        'pk': f.title.pk,
+    }, query='?expand=reviews.comments'),
+    'reviews-list': Case('reviews-list', 'get', lambda f: {
+        'title_id': f.title.pk,
+    }),
+    'reviews-detail': Case('reviews-detail', 'get', lambda f: {
+        'title_id': f.title.pk, 'pk': f.review.pk,
+    }),
+    'comments-list': Case('comments-list', 'get', lambda f: {
+        'title_id': f.title.pk, 'review_id': f.review.pk,
+    }),
+    'comments-detail': Case('comments-detail', 'get', lambda f: {
+        'title_id': f.title.pk, 'review_id': f.review.pk,
+        'pk': f.comment.pk,
+    }),
+    'users-list': Case('users-list', 'get'),
+    'users-get-or-update-me': Case('users-get-or-update-me', 'get'),
+    'users-detail': Case('users-detail', 'get', lambda f: {
+        'username': f.user.username,
+    }),
+}
+
+
+class Fixtures:
+    def __init__(self):
+        from django.contrib.auth.tokens import default_token_generator
+        from django.db.models import Count
+
+        from reviews.models import Review, Title, User
+
+        self.admin, _ = User.objects.get_or_create(
+            username='bench-admin',
+            defaults={'email': 'bench-admin@yamdb.fake', 'role': 'admin'},
+        )
+        self.user = User.objects.exclude(pk=self.admin.pk).first()
+        self.code = default_token_generator.make_token(self.user)
+        self.review = Review.objects.annotate(
+            comment_count=Count('comments')
+        ).order_by('-comment_count', 'pk').first()
+        self.title = Title.objects.get(pk=self.review.title_id)
+        self.comment = self.review.comments.order_by('pk').first()
+        self.title_ids = list(
+            Title.objects.order_by('pk').values_list('pk', flat=True)[:100]
+        )
+
+
+def resolve(value, fixtures):
+    return value(fixtures) if callable(value) else value
+
+
+def check_coverage():
+    from django.urls import URLResolver
+
+    from api import urls
+
+    def names(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from names(pattern.url_patterns)
+            elif pattern.name:
+                yield pattern.name
+
+    covered = {case.route for case in CASES.values()}
+    missing = sorted(set(names(urls.urlpatterns)) - covered)
+    if missing:
+        raise SystemExit(f'No benchmark case for routes: {missing}')
+
+
+def request(client, case, fixtures):
+    from django.core.cache import cache
+    from django.db import transaction
+    from django.urls import reverse
+
+    url = reverse(case.route, kwargs=resolve(case.kwargs, fixtures))
+    url += resolve(case.query, fixtures)
+    data = resolve(case.data, fixtures)
+    cache.clear()
+    with transaction.atomic():
+        response = getattr(client, case.method)(url, data, format='json')
+        transaction.set_rollback(True)
+    if response.status_code not in case.statuses:
+        raise SystemExit(
+            f'{case.method.upper()} {url} returned {response.status_code}'
+        )
+
+
+def measure_case(client, case, fixtures, repeat):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        request(client, case, fixtures)
+    queries = len(context)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        request(client, case, fixtures)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        request(client, case, fixtures)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'queries': queries,
+        'time_ms': round(statistics.median(timings) * 1000, 3),
+        'alloc_kb': round(peak / 1024, 1),
+    }
+
+
+def run(sizes, repeat):
+    from django.core.management import call_command
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    results = {}
+    for size in sizes:
+        call_command('flush', interactive=False, verbosity=0)
+        call_command('generate_data', stdout=sys.stderr, **SIZES[size])
+        fixtures = Fixtures()
+        client = APIClient()
+        token = AccessToken.for_user(fixtures.admin)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        results[size] = {
+            name: measure_case(client, case, fixtures, repeat)
+            for name, case in CASES.items()
+        }
+    return results
+
+
+def compare(results, baseline, reference, time_threshold):
+    failures = []
+    for name in CASES:
+        counts = {size: results[size][name]['queries'] for size in results}
+        if len(set(counts.values())) > 1:
+            failures.append(f'{name}: query count grows with data {counts}')
+    for size, cases in results.items():
+        for name, current in cases.items():
+            base = baseline.get(size, {}).get(name)
+            if base is not None and current['queries'] > base['queries']:
+                failures.append(
+                    f'{name} [{size}]: {current["queries"]} queries, '
+                    f'baseline {base["queries"]}'
+                )
+            previous = reference.get(size, {}).get(name)
+            if previous is None:
+                continue
+            limit = previous['time_ms'] * (1 + time_threshold)
+            limit = max(limit, previous['time_ms'] + TIME_NOISE_MS)
+            if current['time_ms'] > limit:
+                failures.append(
+                    f'{name} [{size}]: {current["time_ms"]} ms, '
+                    f'previously {previous["time_ms"]} ms'
+                )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', nargs='+', choices=tuple(SIZES),
+                        default=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--time-threshold', type=float, default=0.5,
+                        help='Allowed relative slowdown of the median time.')
+    parser.add_argument('--update', action='store_true',
+                        help='Overwrite the stored query-count baseline.')
+    parser.add_argument('--compare-times', metavar='RESULTS',
+                        help='Output of an earlier run on this machine.')
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    os.environ.setdefault(
+        'EMAIL_BACKEND', 'django.core.mail.backends.locmem.EmailBackend'
+    )
+    # The benchmark runs in this process only.
+    os.environ.setdefault('CACHE_SINGLE_PROCESS', 'True')
+    os.environ.setdefault('METRICS_ALLOWED_IPS', '127.0.0.1')
+    setup_django()
+    from django.contrib.auth.tokens import default_token_generator
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    # Codes embed a timestamp in seconds and the view compares strings, so
+    # pin the clock to keep send_token from failing on a second boundary.
+    now = default_token_generator._now()
+    default_token_generator._now = lambda: now
+
+    check_coverage()
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+    results = run(args.sizes, args.repeat)
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output + '\n')
+    print(output)
+    if args.update:
+        baseline = {
+            size: {
+                name: {'queries': stats['queries']}
+                for name, stats in cases.items()
+            }
+            for size, cases in results.items()
+        }
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        BASELINE_PATH.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + '\n'
+        )
+        return
+    baseline = {}
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text())
+    reference = {}
+    if args.compare_times:
+        with open(args.compare_times) as reference_file:
+            reference = json.load(reference_file)
+    failures = compare(results, baseline, reference, args.time_threshold)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
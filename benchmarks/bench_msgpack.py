@@ -0,0 +1,44 @@
+"""Payload size and encode/decode speed of JSON versus MessagePack.
+
+Usage: python -m benchmarks.bench_msgpack
+"""
+import json
+from io import BytesIO
+
+from benchmarks.common import load_catalog_pages, measure, setup_django
+
+
+def main():
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import FastJSONParser, MessagePackParser
+    from api.renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+
+    if msgpack is None:
+        print('msgpack is not installed')
+        return
+
+    pairs = (
+        ('json', JSONRenderer(), FastJSONParser()),
+        ('fast-json', FastJSONRenderer(), FastJSONParser()),
+        ('msgpack', MessagePackRenderer(), MessagePackParser()),
+    )
+    results = {}
+    for name, page in load_catalog_pages().items():
+        for label, renderer, parser in pairs:
+            body = renderer.render(page)
+            results[f'{name}:{label}'] = {
+                'bytes': len(body),
+                'encode_ops_per_sec': round(
+                    measure(lambda: renderer.render(page)), 1
+                ),
+                'decode_ops_per_sec': round(
+                    measure(lambda: parser.parse(BytesIO(body))), 1
+                ),
+            }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Encode/decode throughput of the JSON renderers on catalog pages.
+
+Usage: python -m benchmarks.bench_renderers
+"""
+import json
+from io import BytesIO
+
+from benchmarks.common import load_catalog_pages, measure, setup_django
+
+
+def main():
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import FastJSONParser
+    from api.renderers import FastJSONRenderer, orjson
+
+    if orjson is None:
+        print('orjson is not installed, FastJSONRenderer uses stdlib json')
+
+    results = {}
+    for name, page in load_catalog_pages().items():
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            body = renderer.render(page)
+            ops = measure(lambda: renderer.render(page))
+            results[f'{name}:{type(renderer).__name__}'] = {
+                'bytes': len(body),
+                'ops_per_sec': round(ops, 1),
+                'mb_per_sec': round(ops * len(body) / 2 ** 20, 1),
+            }
+        body = JSONRenderer().render(page)
+        for parser in (JSONParser(), FastJSONParser()):
+            ops = measure(lambda: parser.parse(BytesIO(body)))
+            results[f'{name}:{type(parser).__name__}'] = {
+                'bytes': len(body),
+                'ops_per_sec': round(ops, 1),
+                'mb_per_sec': round(ops * len(body) / 2 ** 20, 1),
+            }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
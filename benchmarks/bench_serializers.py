@@ -0,0 +1,185 @@
+"""Throughput and allocations of the API serializers on in-memory rows.
+
+Model instances are built from static/data without touching the database,
+with related objects and genre prefetches already cached, so only the
+serializer layer is measured. Every serializer runs on 1/100/1000 rows,
+once with all fields ("nested") and once with its related fields omitted
+through ?omit= ("flat").
+
+Usage:
+    python -m benchmarks.bench_serializers
+    python -m benchmarks.bench_serializers --only ReviewSerializer \\
+        --output result.json --compare baseline.json
+"""
+import argparse
+import json
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.common import measure, read_csv, setup_django
+
+SIZES = (1, 100, 1000)
+RELATED_FIELDS = {
+    'TitleSerializer': 'genre,category',
+    'ReadOnlyTitleSerializer': 'genre,category',
+    'ReviewSerializer': 'author,title',
+    'CommentSerializer': 'author,review,title',
+}
+
+
+def parse_date(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone(
+        timezone.utc
+    )
+
+
+def cycle(items, size):
+    return [items[i % len(items)] for i in range(size)]
+
+
+def build_instances():
+    from reviews.models import Category, Comment, Genre, Review, Title, User
+
+    categories = {
+        row['id']: Category(id=int(row['id']), name=row['name'],
+                            slug=row['slug'])
+        for row in read_csv('category')
+    }
+    genres = {
+        row['id']: Genre(id=int(row['id']), name=row['name'],
+                         slug=row['slug'])
+        for row in read_csv('genre')
+    }
+    users = {
+        row['id']: User(
+            id=int(row['id']), username=row['username'], email=row['email'],
+            role=row['role'], bio=row['bio'], first_name=row['first_name'],
+            last_name=row['last_name'],
+        )
+        for row in read_csv('users')
+    }
+    title_genres = {}
+    for row in read_csv('genre_title'):
+        title_genres.setdefault(row['title_id'], []).append(
+            genres[row['genre_id']]
+        )
+    titles = {}
+    for row in read_csv('titles'):
+        title = Title(
+            id=int(row['id']), name=row['name'], year=int(row['year']),
+            category=categories[row['category']],
+        )
+        title.rating = 7
+        prefetched = title.genre.all()
+        prefetched._result_cache = title_genres.get(row['id'], [])
+        prefetched._prefetch_done = True
+        title._prefetched_objects_cache = {'genre': prefetched}
+        titles[row['id']] = title
+    reviews = {
+        row['id']: Review(
+            id=int(row['id']), title=titles[row['title_id']],
+            text=row['text'], author=users[row['author_id']],
+            score=int(row['score']), pub_date=parse_date(row['pub_date']),
+        )
+        for row in read_csv('review')
+    }
+    comments = [
+        Comment(
+            id=int(row['id']), review=reviews[row['review_id']],
+            text=row['text'], author=users[row['author']],
+            pub_date=parse_date(row['pub_date']),
+        )
+        for row in read_csv('comments')
+    ]
+    return {
+        'CategorySerializer': list(categories.values()),
+        'GenreSerializer': list(genres.values()),
+        'TitleSerializer': list(titles.values()),
+        'ReadOnlyTitleSerializer': list(titles.values()),
+        'ReviewSerializer': list(reviews.values()),
+        'CommentSerializer': comments,
+        'UserSerializer': list(users.values()),
+    }
+
+
+def make_request(omit):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    params = {'omit': omit} if omit else {}
+    return Request(APIRequestFactory().get('/', params))
+
+
+def peak_allocation(func):
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run(instances, names, sizes, min_time):
+    from api import serializers
+
+    results = {}
+    for name in names:
+        serializer_class = getattr(serializers, name)
+        variants = {'nested': ''}
+        if name in RELATED_FIELDS:
+            variants['flat'] = RELATED_FIELDS[name]
+        for variant, omit in variants.items():
+            context = {'request': make_request(omit)}
+            for size in sizes:
+                rows = cycle(instances[name], size)
+
+                def serialize():
+                    return serializer_class(
+                        rows, many=True, context=context
+                    ).data
+
+                ops = measure(serialize, min_time)
+                results[f'{name}:{variant}:{size}'] = {
+                    'ops_per_sec': round(ops, 1),
+                    'rows_per_sec': round(ops * size),
+                    'peak_kb': round(peak_allocation(serialize) / 1024, 1),
+                }
+    return results
+
+
+def compare(results, baseline):
+    return {
+        key: round(stats['ops_per_sec'] / baseline[key]['ops_per_sec'], 3)
+        for key, stats in results.items()
+        if baseline.get(key, {}).get('ops_per_sec')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--only', nargs='+', metavar='SERIALIZER')
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    parser.add_argument('--min-time', type=float, default=0.5)
+    parser.add_argument('--output')
+    parser.add_argument('--compare')
+    args = parser.parse_args()
+
+    setup_django()
+    instances = build_instances()
+    names = args.only or list(instances)
+    results = run(instances, names, args.sizes, args.min_time)
+    output = {'results': results}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        output['speedup'] = compare(results, baseline)
+    text = json.dumps(output, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(text + '\n')
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
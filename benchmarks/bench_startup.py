@@ -0,0 +1,84 @@
+"""Startup time and per-request overhead of the settings profiles.
+
+Every run starts a fresh interpreter, so import and setup costs are
+measured cold.
+
+Usage: python -m benchmarks.bench_startup [--runs 5] [--requests 500]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import PROJECT_DIR, ROOT_DIR
+
+PROFILES = ('api_yamdb.settings', 'api_yamdb.settings_api')
+URL = '/api/v1/'
+
+
+def child(settings_module, requests):
+    started = time.perf_counter()
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    sys.path.insert(0, str(PROJECT_DIR))
+    from api_yamdb.wsgi import application  # noqa: F401
+    from django.test import Client
+
+    client = Client()
+    loaded = time.perf_counter()
+    client.get(URL, HTTP_ACCEPT='application/json')
+    first_request = time.perf_counter()
+    for _ in range(requests):
+        client.get(URL, HTTP_ACCEPT='application/json')
+    finished = time.perf_counter()
+    print(json.dumps({
+        'setup_ms': (loaded - started) * 1000,
+        'first_request_ms': (first_request - loaded) * 1000,
+        'per_request_us': (finished - first_request) / requests * 10 ** 6,
+    }))
+
+
+def run_child(settings_module, requests):
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_startup',
+         '--child', settings_module, '--requests', str(requests)],
+        cwd=ROOT_DIR, check=True, capture_output=True, text=True,
+    ).stdout
+    sample = json.loads(output)
+    sample['process_ms'] = (time.perf_counter() - started) * 1000
+    return sample
+
+
+def summarize(samples):
+    return {
+        key: round(statistics.median(sample[key] for sample in samples), 2)
+        for key in samples[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--child')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.requests)
+        return
+    samples = {profile: [] for profile in PROFILES}
+    # Profiles are interleaved so that machine noise hits both equally.
+    for _ in range(args.runs):
+        for profile in PROFILES:
+            samples[profile].append(run_child(profile, args.requests))
+    print(json.dumps({
+        profile: summarize(profile_samples)
+        for profile, profile_samples in samples.items()
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
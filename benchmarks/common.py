@@ -0,0 +1,103 @@
+import csv
+import math
+import os
+import sys
+import timeit
+from collections import defaultdict
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = ROOT_DIR / 'api_yamdb'
+DATA_DIR = PROJECT_DIR / 'static' / 'data'
+PAGE_SIZE = 100
+
+
+def setup_django():
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    import django
+
+    django.setup()
+
+
+def read_csv(name):
+    with open(DATA_DIR / f'{name}.csv', encoding='utf-8') as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+def repeat_to_size(items, size):
+    return [dict(items[i % len(items)], id=i + 1) for i in range(size)]
+
+
+def load_catalog_pages(page_size=PAGE_SIZE):
+    categories = {row['id']: row for row in read_csv('category')}
+    genres = {row['id']: row for row in read_csv('genre')}
+    title_genres = defaultdict(list)
+    for row in read_csv('genre_title'):
+        genre = genres[row['genre_id']]
+        title_genres[row['title_id']].append(
+            {'name': genre['name'], 'slug': genre['slug']}
+        )
+    users = {row['id']: row['username'] for row in read_csv('users')}
+    title_reviews = defaultdict(list)
+    reviews = []
+    titles_by_id = {row['id']: row for row in read_csv('titles')}
+    for row in read_csv('review'):
+        title_reviews[row['title_id']].append(row)
+        reviews.append({
+            'id': int(row['id']),
+            'text': row['text'],
+            'author': users.get(row['author_id'], 'unknown'),
+            'score': int(row['score']),
+            'pub_date': row['pub_date'],
+            'title': titles_by_id[row['title_id']]['name'],
+        })
+
+    titles = []
+    for row in titles_by_id.values():
+        scores = [int(review['score'])
+                  for review in title_reviews[row['id']]]
+        category = categories.get(row['category'])
+        titles.append({
+            'id': int(row['id']),
+            'name': row['name'],
+            'year': int(row['year']),
+            'description': '\n'.join(
+                review['text'] for review in title_reviews[row['id']]
+            ),
+            'genre': title_genres[row['id']],
+            'category': category and {
+                'name': category['name'], 'slug': category['slug']
+            },
+            'rating': round(sum(scores) / len(scores)) if scores else None,
+        })
+
+    def page(results):
+        return {
+            'count': len(results),
+            'next': None,
+            'previous': None,
+            'results': results,
+        }
+
+    return {
+        'titles': page(repeat_to_size(titles, page_size)),
+        'reviews': page(repeat_to_size(reviews, page_size)),
+    }
+
+
+def measure(func, min_time=0.5):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=5, number=number))
+    return number / best
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
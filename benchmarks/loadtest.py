@@ -0,0 +1,327 @@
+"""Load generator replaying the Postman collection flows.
+
+Every virtual user signs up, exchanges the confirmation code for a JWT,
+browses titles, reviews and comments, and posts a review and a comment.
+Confirmation codes are computed locally, so the target server must use
+the same database and SECRET_KEY as this process.
+
+With --serve the server (gunicorn for wsgi, uvicorn for asgi, see
+benchmarks/requirements.txt) runs on a throwaway SQLite database seeded
+with generate_data. With --target the flows write users, reviews and
+comments into the target's database, which has to be seeded beforehand.
+
+Usage:
+    python -m benchmarks.loadtest --serve wsgi --concurrency 8 --duration 30
+    python -m benchmarks.loadtest --target http://127.0.0.1:8000 \\
+        --output result.json --compare baseline.json
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from importlib.util import find_spec
+from pathlib import Path
+
+import requests
+
+from benchmarks.common import PROJECT_DIR, percentile, setup_django
+
+API = '/api/v1'
+SERVERS = {
+    'wsgi': ('gunicorn', [
+        sys.executable, '-m', 'gunicorn', 'api_yamdb.wsgi:application',
+        '--bind', '{host}:{port}', '--workers', '{workers}',
+        '--log-level', 'warning',
+    ]),
+    'asgi': ('uvicorn', [
+        sys.executable, '-m', 'uvicorn', 'api_yamdb.asgi:application',
+        '--host', '{host}', '--port', '{port}', '--workers', '{workers}',
+        '--log-level', 'warning',
+    ]),
+}
+
+
+def prepare_data(seed):
+    from django.core.management import call_command
+
+    from reviews.models import Review, Title
+
+    if seed:
+        call_command('migrate', run_syncdb=True, verbosity=0)
+        call_command(
+            'generate_data', users=200, titles=500, reviews=5000,
+            comments=10000, stdout=sys.stderr
+        )
+    if not Title.objects.exists():
+        raise SystemExit('В базе нет произведений, заполните её generate_data')
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    reviews = defaultdict(list)
+    for review_id, title_id in Review.objects.values_list('id', 'title_id'):
+        reviews[title_id].append(review_id)
+    return title_ids, dict(reviews)
+
+
+def confirmation_code(username):
+    from django.contrib.auth.tokens import default_token_generator
+
+    from reviews.models import User
+
+    return default_token_generator.make_token(
+        User.objects.get(username=username)
+    )
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, route, latency, ok):
+        with self.lock:
+            self.latencies[route].append(latency)
+            if not ok:
+                self.errors[route] += 1
+
+    def report(self, elapsed):
+        routes = {}
+        for route, latencies in sorted(self.latencies.items()):
+            routes[route] = {
+                'count': len(latencies),
+                'errors': self.errors[route],
+                'error_rate': round(self.errors[route] / len(latencies), 4),
+                'rps': round(len(latencies) / elapsed, 2),
+                'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+                'max_ms': round(max(latencies) * 1000, 2),
+            }
+        total = sum(route['count'] for route in routes.values())
+        errors = sum(route['errors'] for route in routes.values())
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'requests': total,
+            'rps': round(total / elapsed, 2),
+            'errors': errors,
+            'error_rate': round(errors / total, 4) if total else 0,
+            'routes': routes,
+        }
+
+
+class VirtualUser:
+    def __init__(self, target, recorder, title_ids, reviews, browse):
+        self.target = target.rstrip('/')
+        self.recorder = recorder
+        self.title_ids = title_ids
+        self.reviews = reviews
+        self.browse = browse
+        self.session = requests.Session()
+        self.rng = random.Random()
+
+    def call(self, route, method, path, expected=(200,), **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, self.target + API + path, timeout=30, **kwargs
+            )
+        except requests.RequestException:
+            self.recorder.record(route, time.perf_counter() - started, False)
+            return None
+        self.recorder.record(
+            route, time.perf_counter() - started,
+            response.status_code in expected
+        )
+        return response
+
+    def run_flow(self):
+        username = f'load-{uuid.uuid4().hex[:12]}'
+        response = self.call('signup', 'POST', '/auth/signup/', json={
+            'username': username, 'email': f'{username}@yamdb.fake',
+        })
+        if response is None or response.status_code != 200:
+            return
+        response = self.call('send_token', 'POST', '/auth/token/', json={
+            'username': username,
+            'confirmation_code': confirmation_code(username),
+        })
+        if response is None or response.status_code != 200:
+            return
+        self.session.headers['Authorization'] = (
+            f'Bearer {response.json()["token"]}'
+        )
+
+        self.call('categories-list', 'GET', '/categories/')
+        self.call('genres-list', 'GET', '/genres/')
+        for _ in range(self.browse):
+            page = self.rng.randint(1, max(1, len(self.title_ids) // 100))
+            self.call('titles-list', 'GET', f'/titles/?page={page}')
+            title_id = self.rng.choice(self.title_ids)
+            self.call('titles-detail', 'GET', f'/titles/{title_id}/')
+            self.call('reviews-list', 'GET', f'/titles/{title_id}/reviews/')
+            review_ids = self.reviews.get(title_id)
+            if review_ids:
+                review_id = self.rng.choice(review_ids)
+                self.call(
+                    'comments-list', 'GET',
+                    f'/titles/{title_id}/reviews/{review_id}/comments/'
+                )
+
+        title_id = self.rng.choice(self.title_ids)
+        response = self.call(
+            'reviews-create', 'POST', f'/titles/{title_id}/reviews/',
+            expected=(201,),
+            json={
+                'text': 'Нагрузочный отзыв',
+                'score': self.rng.randint(1, 10),
+            },
+        )
+        if response is not None and response.status_code == 201:
+            self.call(
+                'comments-create', 'POST',
+                f'/titles/{title_id}/reviews/{response.json()["id"]}'
+                '/comments/',
+                expected=(201,), json={'text': 'Нагрузочный комментарий'},
+            )
+
+
+def wait_for_server(target, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(target + API + '/', timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server at {target} did not start')
+
+
+def check_server(kind):
+    module, _ = SERVERS[kind]
+    if find_spec(module) is None:
+        raise SystemExit(
+            f'Для --serve {kind} нужен {module}: '
+            'pip install -r benchmarks/requirements.txt'
+        )
+
+
+def start_server(kind, host, port, workers):
+    _, command = SERVERS[kind]
+    command = [
+        part.format(host=host, port=port, workers=workers)
+        for part in command
+    ]
+    env = dict(
+        os.environ,
+        DEBUG='False',
+        CACHE_SINGLE_PROCESS=str(workers == 1),
+        EMAIL_BACKEND='django.core.mail.backends.dummy.EmailBackend',
+    )
+    return subprocess.Popen(
+        command, cwd=PROJECT_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def run(args, title_ids, reviews):
+    recorder = Recorder()
+    deadline = time.monotonic() + args.duration
+    flows = itertools.count()
+
+    def worker():
+        user = VirtualUser(
+            args.target, recorder, title_ids, reviews, args.browse
+        )
+        while time.monotonic() < deadline:
+            if args.flows and next(flows) >= args.flows:
+                return
+            user.run_flow()
+
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=worker) for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder.report(time.perf_counter() - started)
+
+
+def compare(result, baseline):
+    changes = {}
+    for route, stats in result['routes'].items():
+        base = baseline['routes'].get(route)
+        if not base:
+            continue
+        changes[route] = {
+            key: round(stats[key] / base[key], 3) if base[key] else None
+            for key in ('rps', 'p50_ms', 'p95_ms', 'p99_ms')
+        }
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--target', default='http://127.0.0.1:8000')
+    parser.add_argument('--serve', choices=tuple(SERVERS))
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Server processes for --serve.')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--flows', type=int, default=0,
+                        help='Stop after this many flows (0: no limit).')
+    parser.add_argument('--browse', type=int, default=5,
+                        help='Browse iterations per flow.')
+    parser.add_argument('--output')
+    parser.add_argument('--compare')
+    args = parser.parse_args()
+
+    database_dir = None
+    if args.serve:
+        check_server(args.serve)
+        database_dir = tempfile.mkdtemp(prefix='yamdb-loadtest-')
+        os.environ['SQLITE_PATH'] = str(
+            Path(database_dir) / 'loadtest.sqlite3'
+        )
+    server = None
+    try:
+        setup_django()
+        title_ids, reviews = prepare_data(seed=bool(args.serve))
+        if args.serve:
+            host, port = '127.0.0.1', 8765
+            args.target = f'http://{host}:{port}'
+            server = start_server(args.serve, host, port, args.workers)
+        wait_for_server(args.target)
+        result = run(args, title_ids, reviews)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if database_dir is not None:
+            shutil.rmtree(database_dir, ignore_errors=True)
+    result['config'] = {
+        'target': args.target, 'server': args.serve,
+        'workers': args.workers if args.serve else None,
+        'concurrency': args.concurrency, 'browse': args.browse,
+    }
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            result['compare'] = compare(result, json.load(baseline_file))
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
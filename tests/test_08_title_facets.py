@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleFacetsAPI:
+
+    FACETS_URL = '/api/v1/titles/facets/'
+
+    def test_01_facets_not_auth(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(self.FACETS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.FACETS_URL}` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert data['count'] == 2, (
+            f'Проверьте, что ответ на GET-запрос к `{self.FACETS_URL}` '
+            'содержит общее количество произведений в ключе `count`.'
+        )
+        genres = {item['slug']: item['count'] for item in data['genre']}
+        assert genres == {'horror': 1, 'comedy': 1, 'drama': 1}, (
+            f'Проверьте, что ответ на GET-запрос к `{self.FACETS_URL}` '
+            'содержит количество произведений по жанрам.'
+        )
+        categories = {item['slug']: item['count'] for item in data['category']}
+        assert categories == {'films': 1, 'books': 1}, (
+            f'Проверьте, что ответ на GET-запрос к `{self.FACETS_URL}` '
+            'содержит количество произведений по категориям.'
+        )
+        decades = {item['decade']: item['count'] for item in data['decade']}
+        assert decades == {1980: 2}, (
+            f'Проверьте, что ответ на GET-запрос к `{self.FACETS_URL}` '
+            'содержит количество произведений по десятилетиям.'
+        )
+
+    def test_02_facets_filter(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(f'{self.FACETS_URL}?category=films')
+        data = response.json()
+        assert data['count'] == 1, (
+            f'Проверьте, что GET-запрос к `{self.FACETS_URL}` учитывает '
+            'параметры фильтрации произведений.'
+        )
+        genres = {item['slug'] for item in data['genre']}
+        assert genres == {'horror', 'comedy'}, (
+            f'Проверьте, что GET-запрос к `{self.FACETS_URL}` считает '
+            'жанры только для отфильтрованных произведений.'
+        )
+
+    def test_03_facets_cache_invalidation(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(self.FACETS_URL)
+        assert response.json()['count'] == 2
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        response = client.get(self.FACETS_URL)
+        assert response.json()['count'] == 1, (
+            f'Проверьте, что ответ на GET-запрос к `{self.FACETS_URL}` '
+            'обновляется после удаления произведения.'
+        )
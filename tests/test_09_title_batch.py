@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleBatchAPI:
+
+    BATCH_URL = '/api/v1/titles/batch/'
+
+    def test_01_batch_order_and_missing(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        ids = [titles[1]['id'], 999, titles[0]['id']]
+        response = client.get(
+            f'{self.BATCH_URL}?ids={",".join(map(str, ids))}'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.BATCH_URL}` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [item['id'] for item in data['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что GET-запрос к `{self.BATCH_URL}` возвращает '
+            'произведения в порядке переданных id.'
+        )
+        assert data['missing'] == [999], (
+            f'Проверьте, что GET-запрос к `{self.BATCH_URL}` возвращает '
+            'несуществующие id в ключе `missing`.'
+        )
+        assert data['results'][1]['rating'] is None
+        assert len(data['results'][1]['genre']) == 2
+
+    def test_02_batch_invalid(self, client):
+        for query in ('', '?ids=', '?ids=1,a',
+                      '?ids=' + ','.join(map(str, range(1, 102)))):
+            response = client.get(f'{self.BATCH_URL}{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{self.BATCH_URL}{query}` '
+                'возвращает ответ со статусом 400.'
+            )
+
+    def test_03_batch_queries(self, client, admin_client,
+                              django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        ids = ','.join(str(title['id']) for title in titles)
+        with django_assert_max_num_queries(2):
+            client.get(f'{self.BATCH_URL}?ids={ids}')
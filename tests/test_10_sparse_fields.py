@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10SparseFieldsAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_titles_fields(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?fields=id,name,rating')
+        assert response.status_code == HTTPStatus.OK
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'rating'}, (
+                f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с '
+                'параметром `fields` возвращает только указанные поля.'
+            )
+
+    def test_02_titles_omit(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/?omit=description,genre'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {
+            'id', 'name', 'year', 'category', 'rating'
+        }, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}<title_id>/` с '
+            'параметром `omit` не возвращает указанные поля.'
+        )
+        assert set(response.json()['category']) == {'name', 'slug'}, (
+            'Параметр `omit` не должен влиять на вложенные объекты.'
+        )
+
+    def test_03_reviews_fields(self, client, admin_client, user_client,
+                               moderator_client, user, moderator):
+        reviews, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(f'{url}?fields=id,score')
+        for review in response.json()['results']:
+            assert set(review) == {'id', 'score'}, (
+                f'Проверьте, что GET-запрос к `{url}` с параметром `fields` '
+                'возвращает только указанные поля.'
+            )
+
+    def test_04_fields_ignored_on_write(self, admin_client):
+        create_titles(admin_client)
+        data = {'name': 'Фильм', 'slug': 'film-new'}
+        response = admin_client.post(
+            '/api/v1/categories/?fields=slug', data=data
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json() == data
+
+    def test_05_fields_with_multi_genre_filter(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        # The first title has two genres matching `o`: horror and comedy.
+        response = client.get(f'{self.TITLES_URL}?genre=o&fields=id,name')
+        assert response.status_code == HTTPStatus.OK
+        ids = [title['id'] for title in response.json()['results']]
+        assert ids == [titles[0]['id']], (
+            'Проверьте, что фильтр по жанру с параметром `fields` не '
+            'дублирует произведения с несколькими подходящими жанрами.'
+        )
+        assert response.json()['count'] == 1
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/?genre=o&fields=id,name'
+        )
+        assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleExpandAPI:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_expand_reviews_and_comments(self, client, admin_client,
+                                            user_client, moderator_client,
+                                            user, moderator,
+                                            django_assert_max_num_queries):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        with django_assert_max_num_queries(5):
+            response = client.get(f'{url}?expand=reviews,reviews.comments')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['id'] == titles[0]['id']
+        assert {review['id'] for review in data['reviews']} == {
+            review['id'] for review in reviews
+        }, (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `expand` '
+            'возвращает отзывы к произведению.'
+        )
+        expanded = {
+            review['id']: review['comments'] for review in data['reviews']
+        }
+        assert {comment['id'] for comment in expanded[reviews[0]['id']]} == {
+            comment['id'] for comment in comments
+        }, (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `expand` '
+            'возвращает комментарии к отзывам.'
+        )
+        assert expanded[reviews[1]['id']] == []
+
+    def test_02_expand_limit(self, client, admin_client, user_client,
+                             moderator_client, user, moderator):
+        _, _, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(
+            f'{url}?expand=reviews.comments&expand_limit=1'
+        )
+        data = response.json()
+        assert len(data['reviews']) == 1
+        assert len(data['reviews'][0]['comments']) <= 1
+
+    def test_03_expand_invalid(self, client, admin_client, user_client,
+                               user):
+        _, _, titles = create_comments(admin_client, {user: user_client})
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        for query in ('?expand=users', '?expand=reviews&expand_limit=0',
+                      '?expand=reviews&expand_limit=a'):
+            response = client.get(f'{url}{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{url}{query}` возвращает '
+                'ответ со статусом 400.'
+            )
+        response = client.get(url)
+        assert 'reviews' not in response.json()
@@ -0,0 +1,40 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12RenderersAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_json_round_trip(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        data = {
+            'name': 'Сталкер',
+            'year': 1979,
+            'genre': [genres[2]['slug']],
+            'category': categories[0]['slug'],
+            'description': 'Зона\u2028Комната',
+        }
+        response = admin_client.post(self.TITLES_URL, data=data,
+                                     format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос с JSON-телом к `{self.TITLES_URL}` '
+            'возвращает ответ со статусом 201.'
+        )
+        response = client.get(f'{self.TITLES_URL}{response.json()["id"]}/')
+        assert 'Сталкер'.encode() in response.content, (
+            'Проверьте, что кириллица в ответе не экранируется.'
+        )
+        assert b'\\u2028' in response.content
+        assert response.json()['description'] == data['description']
+
+    def test_02_json_parse_error(self, admin_client):
+        response = admin_client.generic(
+            'POST', self.TITLES_URL, '{"name": NaN}',
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
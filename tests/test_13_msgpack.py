@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+msgpack = pytest.importorskip('msgpack')
+
+MSGPACK = 'application/msgpack'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13MessagePackAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_msgpack_list(self, client, admin_client):
+        create_titles(admin_client)
+        json_data = client.get(self.TITLES_URL).json()
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT=MSGPACK)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == MSGPACK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с заголовком '
+            f'`Accept: {MSGPACK}` возвращает ответ в формате MessagePack.'
+        )
+        assert msgpack.unpackb(response.content) == json_data
+
+    def test_02_msgpack_write(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = user_client.generic(
+            'POST', url, msgpack.packb({'text': 'Отзыв', 'score': 7}),
+            content_type=MSGPACK, HTTP_ACCEPT=MSGPACK
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос с телом в формате MessagePack к '
+            f'`{url}` возвращает ответ со статусом 201.'
+        )
+        data = msgpack.unpackb(response.content)
+        assert data['text'] == 'Отзыв'
+        assert data['score'] == 7
+
+    def test_03_msgpack_parse_error(self, admin_client):
+        response = admin_client.generic(
+            'POST', self.TITLES_URL, b'\xc1', content_type=MSGPACK
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,45 @@
+import gzip
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14CompressionAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_gzip(self, client, admin_client, monkeypatch):
+        monkeypatch.setattr('api.middleware.COMPRESSION_MIN_SIZE', 100)
+        monkeypatch.setattr('api.middleware.brotli', None)
+        create_titles(admin_client)
+        plain = client.get(self.TITLES_URL)
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Encoding'] == 'gzip', (
+            f'Проверьте, что ответ на GET-запрос к `{self.TITLES_URL}` '
+            'сжимается, если клиент поддерживает gzip.'
+        )
+        assert 'Accept-Encoding' in response['Vary']
+        assert gzip.decompress(response.content) == plain.content
+        cached = client.get(self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert cached.content == response.content
+
+    def test_02_small_response_not_compressed(self, client):
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответы меньше порога не сжимаются.'
+        )
+
+    def test_03_brotli(self, client, admin_client, monkeypatch):
+        brotli = pytest.importorskip('brotli')
+        monkeypatch.setattr('api.middleware.COMPRESSION_MIN_SIZE', 100)
+        create_titles(admin_client)
+        plain = client.get(self.TITLES_URL)
+        response = client.get(
+            self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip, deflate, br'
+        )
+        assert response['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.content) == plain.content
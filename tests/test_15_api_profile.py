@@ -0,0 +1,54 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+from tests.conftest import MANAGE_PATH
+
+SCRIPT = '''
+import json
+import django
+django.setup()
+from django.conf import settings
+from django.test import Client
+client = Client()
+print(json.dumps({
+    'apps': settings.INSTALLED_APPS,
+    'middleware': settings.MIDDLEWARE,
+    'root': client.get('/api/v1/', HTTP_ACCEPT='application/json').status_code,
+    'admin': client.get('/admin/').status_code,
+}))
+'''
+
+
+def test_api_settings_profile():
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE='api_yamdb.settings_api',
+        SECRET_KEY=os.environ.get('SECRET_KEY', 'test'),
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', SCRIPT], cwd=MANAGE_PATH, env=env,
+        check=True, capture_output=True, text=True,
+    ).stdout
+    result = json.loads(output)
+    assert 'django.contrib.admin' not in result['apps']
+    assert 'django.contrib.sessions' not in result['apps']
+    assert result['root'] == 200, (
+        'Проверьте, что API доступно в профиле настроек '
+        '`api_yamdb.settings_api`.'
+    )
+    assert result['admin'] == 404
+    assert result['middleware'] == [
+        middleware for middleware in settings.MIDDLEWARE
+        if 'session' not in middleware
+        and middleware.rsplit('.', 1)[-1] not in (
+            'CsrfViewMiddleware', 'AuthenticationMiddleware',
+            'MessageMiddleware', 'XFrameOptionsMiddleware',
+        )
+    ], (
+        'Проверьте, что профиль `api_yamdb.settings_api` сохраняет '
+        'middleware API из основных настроек в том же порядке.'
+    )
@@ -0,0 +1,39 @@
+import logging
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ServerTiming:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_server_timing_header(self, client, admin_client,
+                                     monkeypatch, caplog):
+        monkeypatch.setattr('api.middleware.SERVER_TIMING_SAMPLE_RATE', 1)
+        # Stored title documents skip serialization altogether.
+        monkeypatch.setattr('api.views.MATERIALIZED_TITLES_ENABLED', False)
+        create_titles(admin_client)
+        # Warm the fragment cache so only the page queries are counted.
+        client.get(self.TITLES_URL)
+        with caplog.at_level(logging.INFO, logger='api.timing'):
+            response = client.get(self.TITLES_URL)
+        header = response['Server-Timing']
+        for metric in ('db;dur=', 'serializer;dur=', 'render;dur=',
+                       'total;dur='):
+            assert metric in header, (
+                'Проверьте, что заголовок `Server-Timing` содержит метрику '
+                f'`{metric}`.'
+            )
+        assert 'desc="3 queries"' in header
+        record = caplog.records[-1]
+        assert record.path == self.TITLES_URL
+        assert record.status == 200
+        assert record.db_queries == 3
+        assert record.total_ms >= record.db_ms
+
+    def test_02_sampling_off(self, client):
+        response = client.get(self.TITLES_URL)
+        assert not response.has_header('Server-Timing')
@@ -0,0 +1,111 @@
+import os
+import time
+
+import pytest
+
+from api.metrics import LATENCY_BUCKETS, MetricsRegistry, registry
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    registry.counters.clear()
+    registry.histograms.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Metrics:
+
+    METRICS_URL = '/metrics'
+
+    def test_01_request_metrics(self, client, monkeypatch):
+        monkeypatch.setattr('api.views.METRICS_ALLOWED_IPS', ('127.0.0.1',))
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/1/')
+        response = client.get(self.METRICS_URL)
+        assert response.status_code == 200
+        body = response.content.decode()
+        assert (
+            'yamdb_http_requests_total{method="GET",route="titles-list",'
+            'status="200"} 2.0'
+        ) in body, (
+            f'Проверьте, что `{self.METRICS_URL}` возвращает количество '
+            'запросов с названием маршрута.'
+        )
+        assert (
+            'yamdb_http_requests_total{method="GET",route="titles-detail",'
+            'status="404"} 1.0'
+        ) in body
+        assert (
+            'yamdb_http_request_duration_seconds_count{method="GET",'
+            'route="titles-list"} 2'
+        ) in body
+        assert (
+            'yamdb_http_request_queries_bucket{route="titles-list",le="2"} 2'
+        ) in body
+        assert '# TYPE yamdb_http_request_duration_seconds histogram' in body
+
+    def test_02_metrics_access(self, client, monkeypatch):
+        assert client.get(self.METRICS_URL).status_code == 403, (
+            f'Проверьте, что без настроек `{self.METRICS_URL}` недоступен '
+            'даже с локального адреса.'
+        )
+        monkeypatch.setattr('api.views.METRICS_ALLOWED_IPS', ('127.0.0.1',))
+        remote = {'REMOTE_ADDR': '203.0.113.5'}
+        assert client.get(self.METRICS_URL, **remote).status_code == 403, (
+            f'Проверьте, что `{self.METRICS_URL}` недоступен с адресов вне '
+            'METRICS_ALLOWED_IPS.'
+        )
+        monkeypatch.setattr('api.views.METRICS_TOKEN', 'secret')
+        assert client.get(self.METRICS_URL).status_code == 403, (
+            f'Проверьте, что при заданном METRICS_TOKEN `{self.METRICS_URL}` '
+            'требует токен и с адресов из METRICS_ALLOWED_IPS.'
+        )
+        response = client.get(
+            self.METRICS_URL, HTTP_AUTHORIZATION='Bearer wrong', **remote
+        )
+        assert response.status_code == 403
+        response = client.get(
+            self.METRICS_URL, HTTP_AUTHORIZATION='Bearer secret', **remote
+        )
+        assert response.status_code == 200, (
+            f'Проверьте, что `{self.METRICS_URL}` доступен с токеном '
+            'METRICS_TOKEN.'
+        )
+
+
+def test_multiprocess_aggregation(tmp_path):
+    first = MetricsRegistry(str(tmp_path))
+    first.inc('yamdb_http_requests_total', {'route': 'titles-list'}, 3)
+    first.observe('yamdb_http_request_duration_seconds',
+                  {'route': 'titles-list'}, 0.02, LATENCY_BUCKETS)
+    first.flush()
+    # Both registries live in this process, so move the first snapshot
+    # aside as if another worker had written it.
+    os.replace(first.path(), tmp_path / 'other-process.json')
+
+    second = MetricsRegistry(str(tmp_path))
+    second.inc('yamdb_http_requests_total', {'route': 'titles-list'}, 2)
+    second.observe('yamdb_http_request_duration_seconds',
+                   {'route': 'titles-list'}, 0.5, LATENCY_BUCKETS)
+    body = second.render()
+    assert 'yamdb_http_requests_total{route="titles-list"} 5.0' in body
+    assert (
+        'yamdb_http_request_duration_seconds_bucket{route="titles-list",'
+        'le="0.025"} 1'
+    ) in body
+    assert (
+        'yamdb_http_request_duration_seconds_count{route="titles-list"} 2'
+    ) in body
+
+
+def test_idle_worker_flushes(tmp_path):
+    idle = MetricsRegistry(str(tmp_path), flush_interval=0.05)
+    idle.inc('yamdb_http_requests_total', {'route': 'titles-list'})
+    deadline = time.monotonic() + 5
+    while not os.path.exists(idle.path()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert os.path.exists(idle.path()), (
+        'Проверьте, что процесс без новых запросов всё равно сбрасывает '
+        'накопленные метрики.'
+    )
@@ -0,0 +1,62 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+
+from api.queries import fingerprint, query_stats
+
+
+@pytest.fixture(autouse=True)
+def reset_query_stats():
+    query_stats.reset()
+
+
+def test_fingerprint():
+    assert fingerprint(
+        "SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'  LIMIT 21"
+    ) == 'SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?'
+    assert fingerprint('SELECT 1 WHERE a IN (%s)') == fingerprint(
+        'SELECT 2 WHERE a IN (%s, %s)'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18QueryStatsAPI:
+
+    QUERIES_URL = '/api/v1/debug/queries/'
+
+    def test_01_only_admin(self, client, user_client):
+        assert client.get(self.QUERIES_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.QUERIES_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), (
+            f'Проверьте, что `{self.QUERIES_URL}` доступен только '
+            'администратору.'
+        )
+
+    def test_02_stats_and_slow_queries(self, client, admin_client,
+                                       monkeypatch, caplog):
+        monkeypatch.setattr('api.queries.SLOW_QUERY_THRESHOLD_MS', 0)
+        with caplog.at_level(logging.WARNING, logger='api.slow_queries'):
+            client.get('/api/v1/titles/')
+        response = admin_client.get(self.QUERIES_URL)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        fingerprints = [item['fingerprint'] for item in data['fingerprints']]
+        assert any('FROM "reviews_title"' in item for item in fingerprints)
+        slow = [
+            item for item in data['slow_queries']
+            if item['view'] == 'titles-list'
+            and item['sql'].startswith('SELECT')
+        ]
+        assert slow, (
+            'Проверьте, что медленные запросы сохраняются с именем view.'
+        )
+        assert slow[0]['plan'], 'Для медленного запроса не сохранён план.'
+        assert any(
+            record.view == 'titles-list' for record in caplog.records
+        )
+        response = admin_client.delete(self.QUERIES_URL)
+        assert response.status_code == HTTPStatus.NO_CONTENT
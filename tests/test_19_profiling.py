@@ -0,0 +1,39 @@
+import pstats
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Profiling:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_admin_profile(self, admin_client, monkeypatch, tmp_path):
+        monkeypatch.setattr('api.middleware.PROFILES_DIR', tmp_path)
+        response = admin_client.get(self.TITLES_URL, HTTP_X_PROFILE='1')
+        assert response.status_code == 200
+        filename = response['X-Profile-File']
+        assert 'titles-list' in filename
+        stats = pstats.Stats(str(tmp_path / filename))
+        assert stats.total_calls > 0
+        second = admin_client.get(self.TITLES_URL, HTTP_X_PROFILE='1')
+        assert second['X-Profile-File'] != filename, (
+            'Проверьте, что профили запросов в одну секунду не '
+            'перезаписывают друг друга.'
+        )
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_02_no_profile_for_users(self, client, user_client,
+                                     monkeypatch, tmp_path):
+        monkeypatch.setattr('api.middleware.PROFILES_DIR', tmp_path)
+        for api_client in (client, user_client):
+            response = api_client.get(self.TITLES_URL, HTTP_X_PROFILE='1')
+            assert not response.has_header('X-Profile-File'), (
+                'Профилирование должно быть доступно только администратору.'
+            )
+        invalid = client.get(
+            self.TITLES_URL, HTTP_X_PROFILE='1',
+            HTTP_AUTHORIZATION='Bearer broken'
+        )
+        assert not invalid.has_header('X-Profile-File')
+        assert list(tmp_path.iterdir()) == []
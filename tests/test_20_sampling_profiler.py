@@ -0,0 +1,57 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+
+from api import sampling
+from api.sampling import StackSampler
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_stack_sampler_collects_and_rotates(tmp_path):
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,))
+    worker.start()
+    sampler = StackSampler(hz=200, window=0.2, dump_dir=tmp_path)
+    sampler.start()
+    time.sleep(0.5)
+    sampler.stop()
+    stop.set()
+    sampler.join()
+    worker.join()
+
+    assert sampler.samples > 0
+    assert 'busy_loop' in sampler.collapsed('last')
+    dumps = list(tmp_path.glob('*.collapsed'))
+    assert dumps, 'Сэмплы за окно должны сохраняться в файл.'
+    line = dumps[0].read_text().splitlines()[0]
+    stack, count = line.rsplit(' ', 1)
+    assert ';' in stack and int(count) > 0
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20SamplingProfilerAPI:
+
+    SAMPLING_URL = '/api/v1/debug/sampling/'
+
+    def test_01_endpoint(self, admin_client, user_client, monkeypatch):
+        assert user_client.get(self.SAMPLING_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        monkeypatch.setattr(sampling, 'sampler', None)
+        assert admin_client.get(self.SAMPLING_URL).status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+        sampler = StackSampler(hz=100, dump_dir=None)
+        sampler.sample()
+        monkeypatch.setattr(sampling, 'sampler', sampler)
+        response = admin_client.get(self.SAMPLING_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        assert response['X-Sampler-Samples'] == '1'
+        assert 'test_01_endpoint' in response.content.decode()
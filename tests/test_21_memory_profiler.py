@@ -0,0 +1,50 @@
+import tracemalloc
+from http import HTTPStatus
+
+import pytest
+
+from api.memory import memory_stats
+from tests.utils import create_titles
+
+
+@pytest.fixture(autouse=True)
+def reset_memory_stats():
+    memory_stats.reset()
+    yield
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21MemoryProfilerAPI:
+
+    MEMORY_URL = '/api/v1/debug/memory/'
+
+    def test_01_memory_stats(self, client, admin_client, user_client,
+                             monkeypatch):
+        create_titles(admin_client)
+        monkeypatch.setattr(
+            'api.middleware.MEMORY_PROFILER_SAMPLE_RATE', 1
+        )
+        client.get('/api/v1/titles/')
+        monkeypatch.setattr(
+            'api.middleware.MEMORY_PROFILER_SAMPLE_RATE', 0
+        )
+        assert user_client.get(self.MEMORY_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.get(self.MEMORY_URL)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['tracing'] is False, (
+            'Проверьте, что tracemalloc останавливается после '
+            'профилируемого запроса.'
+        )
+        assert data['routes']['titles-list']['samples'] == 1, (
+            f'Проверьте, что `{self.MEMORY_URL}` возвращает статистику '
+            'памяти по маршрутам.'
+        )
+        assert data['recent'][0]['route'] == 'titles-list'
+        response = admin_client.delete(self.MEMORY_URL)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert admin_client.get(self.MEMORY_URL).json()['routes'] == {}
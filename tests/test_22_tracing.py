@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from api.tracing import FileSpanExporter
+from tests.utils import create_reviews
+
+
+@pytest.fixture
+def span_file(monkeypatch, tmp_path):
+    path = tmp_path / 'spans.jsonl'
+    monkeypatch.setattr('api.middleware.exporter', FileSpanExporter(path))
+    return path
+
+
+def read_spans(path):
+    traces = [json.loads(line) for line in path.read_text().splitlines()]
+    return [
+        [
+            span
+            for scope in trace['resourceSpans'][0]['scopeSpans']
+            for span in scope['spans']
+        ]
+        for trace in traces
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Tracing:
+
+    def test_01_sampled_trace(self, client, admin_client, user_client, user,
+                              monkeypatch, span_file):
+        _, titles = create_reviews(admin_client, {user: user_client})
+        monkeypatch.setattr('api.tracing.TRACING_SAMPLE_RATE', 1)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        [spans] = read_spans(span_file)
+        names = [span['name'] for span in spans]
+        for name in ('GET reviews-list', 'authentication', 'permissions',
+                     'get_queryset', 'db.query', 'serializer', 'render'):
+            assert name in names, f'Не найден span `{name}`.'
+        assert names.count('get_queryset') == 1
+        root = next(span for span in spans if span['name'] == 'GET reviews-list')
+        assert 'parentSpanId' not in root
+        assert root['traceId'] == response['X-Trace-Id']
+        by_id = {span['spanId']: span for span in spans}
+        for span in spans:
+            if span is not root:
+                assert span['parentSpanId'] in by_id
+        query = next(span for span in spans if span['name'] == 'db.query')
+        attributes = {item['key'] for item in query['attributes']}
+        assert {'db.system', 'db.statement'} <= attributes
+
+    def test_02_traceparent(self, client, span_file, monkeypatch):
+        monkeypatch.setattr('api.tracing.TRACING_TRUST_REMOTE_SAMPLING', True)
+        trace_id = '0af7651916cd43dd8448eb211c80319c'
+        client.get(
+            '/api/v1/titles/',
+            HTTP_TRACEPARENT=f'00-{trace_id}-b7ad6b7169203331-01'
+        )
+        client.get(
+            '/api/v1/titles/',
+            HTTP_TRACEPARENT=f'00-{trace_id}-b7ad6b7169203331-00'
+        )
+        traces = read_spans(span_file)
+        assert len(traces) == 1
+        root = next(
+            span for span in traces[0] if span['name'] == 'GET titles-list'
+        )
+        assert root['traceId'] == trace_id
+        assert root['parentSpanId'] == 'b7ad6b7169203331'
+
+    def test_03_not_sampled(self, client, span_file):
+        response = client.get('/api/v1/titles/')
+        assert not response.has_header('X-Trace-Id')
+        assert not span_file.exists()
+
+    def test_04_remote_sampling_not_trusted(self, client, span_file,
+                                            monkeypatch):
+        trace_id = '0af7651916cd43dd8448eb211c80319c'
+        traceparent = f'00-{trace_id}-b7ad6b7169203331-01'
+        response = client.get('/api/v1/titles/', HTTP_TRACEPARENT=traceparent)
+        assert not response.has_header('X-Trace-Id'), (
+            'Проверьте, что флаг sampled из заголовка traceparent не включает '
+            'трассировку без TRACING_TRUST_REMOTE_SAMPLING.'
+        )
+        assert not span_file.exists()
+        monkeypatch.setattr('api.tracing.TRACING_SAMPLE_RATE', 1)
+        response = client.get('/api/v1/titles/', HTTP_TRACEPARENT=traceparent)
+        assert response['X-Trace-Id'] == trace_id
+
+    @pytest.mark.parametrize('traceparent', (
+        f'00-{"a" * 32}-{"b" * 16}-zz',
+        f'00-{"A" * 32}-{"b" * 16}-01',
+        f'00-{"0" * 32}-{"b" * 16}-01',
+        f'00-{"a" * 32}-{"0" * 16}-01',
+        f'ff-{"a" * 32}-{"b" * 16}-01',
+        '00-1-2-3',
+    ))
+    def test_05_malformed_traceparent(self, client, span_file, monkeypatch,
+                                      traceparent):
+        monkeypatch.setattr('api.tracing.TRACING_TRUST_REMOTE_SAMPLING', True)
+        response = client.get('/api/v1/titles/', HTTP_TRACEPARENT=traceparent)
+        assert response.status_code == 200, (
+            'Проверьте, что некорректный заголовок traceparent игнорируется.'
+        )
+        assert not response.has_header('X-Trace-Id')
@@ -0,0 +1,60 @@
+import json
+import threading
+
+import pytest
+
+from api.access_log import AccessLogWriter
+
+
+@pytest.fixture
+def writer(monkeypatch, tmp_path):
+    writer = AccessLogWriter(path=str(tmp_path / 'access.log'))
+    monkeypatch.setattr('api.middleware.access_log', writer)
+    yield writer
+    writer.close()
+
+
+def test_rotation(tmp_path):
+    path = tmp_path / 'access.log'
+    writer = AccessLogWriter(path=str(path), max_bytes=100, backup_count=2)
+    for index in range(10):
+        writer.write([{'index': index, 'padding': 'x' * 40}])
+    assert path.exists()
+    assert (tmp_path / 'access.log.1').exists()
+    assert (tmp_path / 'access.log.2').exists()
+    assert not (tmp_path / 'access.log.3').exists()
+    last = json.loads(path.read_text().splitlines()[-1])
+    assert last['index'] == 9
+
+
+def test_drop_when_queue_full(tmp_path, monkeypatch):
+    writer = AccessLogWriter(path=str(tmp_path / 'access.log'), queue_size=2)
+    release = threading.Event()
+    monkeypatch.setattr(writer, 'run', release.wait)
+    for index in range(5):
+        writer.log({'index': index})
+    assert writer.dropped == 3, (
+        'При заполненной очереди записи должны отбрасываться со счётчиком.'
+    )
+    release.set()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_access_log_middleware(client, user_client, user, writer):
+    client.get('/api/v1/titles/')
+    user_client.get('/api/v1/users/me/')
+    writer.close()
+    records = [
+        json.loads(line)
+        for line in open(writer.path, encoding='utf-8').read().splitlines()
+    ]
+    assert [record['route'] for record in records] == [
+        'titles-list', 'users-get-or-update-me'
+    ]
+    anonymous, authenticated = records
+    assert anonymous['user_id'] is None
+    assert authenticated['user_id'] == user.pk
+    assert anonymous['status'] == 200
+    assert anonymous['queries'] == 1
+    assert anonymous['bytes'] > 0
+    assert anonymous['latency_ms'] > 0
@@ -0,0 +1,89 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+
+from reviews.models import Comment, Review, Title, User
+
+OPTIONS = {
+    'users': 20, 'categories': 3, 'genres': 5, 'titles': 15,
+    'reviews': 120, 'comments': 200, 'seed': 7,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_data_into_database():
+    call_command('generate_data', stdout=StringIO(), **OPTIONS)
+    assert User.objects.count() == OPTIONS['users']
+    assert Title.objects.count() == OPTIONS['titles']
+    assert Comment.objects.count() == OPTIONS['comments']
+    reviews = Review.objects.count()
+    assert 0 < reviews <= OPTIONS['reviews']
+    counts = sorted(
+        Title.objects.annotate(total=Count('reviews'))
+        .values_list('total', flat=True),
+        reverse=True
+    )
+    assert counts[0] > counts[len(counts) // 2], (
+        'Отзывы должны распределяться неравномерно.'
+    )
+    assert Review.objects.filter(pub_date__year__lt=2023).exists()
+    assert 'я' in ''.join(Review.objects.values_list('text', flat=True))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_data_resets_sequences(monkeypatch):
+    from django.db import connection
+
+    reset_models = []
+
+    def sequence_reset_sql(style, models):
+        reset_models.extend(models)
+        return []
+
+    monkeypatch.setattr(
+        connection.ops, 'sequence_reset_sql', sequence_reset_sql
+    )
+    call_command('generate_data', stdout=StringIO(), **OPTIONS)
+    assert {Comment, Review, Title, User} <= set(reset_models), (
+        'Проверьте, что после загрузки с явными id сбрасываются '
+        'последовательности.'
+    )
+    User.objects.create(username='after-generate', email='a@yamdb.fake')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_data_renders_only_new_documents():
+    existing = Title.objects.create(name='Старое', year=1990)
+    Title.objects.filter(pk=existing.pk).update(document='{"id":0}')
+    call_command('generate_data', stdout=StringIO(), **OPTIONS)
+    assert Title.objects.get(pk=existing.pk).document == '{"id":0}', (
+        'Проверьте, что generate_data не трогает документы уже '
+        'существующих произведений.'
+    )
+    assert not Title.objects.exclude(pk=existing.pk).filter(
+        document__isnull=True
+    ).exists(), (
+        'Проверьте, что generate_data сохраняет документы новых '
+        'произведений.'
+    )
+
+
+def test_generate_data_csv_is_reproducible(tmp_path):
+    for name in ('first', 'second'):
+        call_command(
+            'generate_data', csv=str(tmp_path / name), stdout=StringIO(),
+            **OPTIONS
+        )
+    for table in ('titles', 'review', 'comments', 'users'):
+        first = (tmp_path / 'first' / f'{table}.csv').read_text()
+        assert first == (tmp_path / 'second' / f'{table}.csv').read_text()
+    with open(tmp_path / 'first' / 'review.csv', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == [
+        'id', 'title_id', 'text', 'author_id', 'score', 'pub_date'
+    ]
+    pairs = [(row['title_id'], row['author_id']) for row in rows]
+    assert len(pairs) == len(set(pairs))
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(client, url, review):
+    from api.cache import bump_version
+    from api.signals import comments_version_name, reviews_version_name
+
+    client.get(url)
+    # Measure a page cache miss with the fragment cache already warm.
+    bump_version(reviews_version_name(review.title_id))
+    bump_version(comments_version_name(review.pk))
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(context)
+
+
+def add_data(review, size):
+    from reviews.models import Comment, Review, Title, User
+
+    start = User.objects.count()
+    for i in range(start, start + size):
+        author = User.objects.create(
+            username=f'author-{i}', email=f'author-{i}@yamdb.fake'
+        )
+        title = Title.objects.create(
+            name=f'Фильм {i}', year=2000, category=review.title.category
+        )
+        title.genre.set(review.title.genre.all())
+        Review.objects.create(
+            title=review.title, author=author, text='Отзыв', score=5
+        )
+        Comment.objects.create(
+            review=review, author=author, text='Комментарий'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25QueryCountsAPI:
+
+    @pytest.mark.parametrize('url_template', (
+        '/api/v1/titles/',
+        '/api/v1/titles/{title_id}/reviews/',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+    ))
+    def test_01_list_queries_do_not_grow(self, client, user, url_template):
+        from reviews.models import Category, Genre, Review, Title
+
+        title = Title.objects.create(
+            name='Фильм', year=2000,
+            category=Category.objects.create(name='Фильм', slug='film'),
+        )
+        title.genre.add(Genre.objects.create(name='Драма', slug='drama'))
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=7
+        )
+        url = url_template.format(title_id=title.id, review_id=review.id)
+
+        add_data(review, 1)
+        expected = count_queries(client, url, review)
+        add_data(review, 20)
+        assert count_queries(client, url, review) == expected, (
+            f'Проверьте, что число запросов к БД при GET-запросе к `{url}` '
+            'не зависит от количества объектов на странице.'
+        )
@@ -0,0 +1,146 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26CompiledSerializersAPI:
+
+    def get_urls(self, admin_client, user_client, moderator_client, user,
+                 moderator):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title_id = titles[0]['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        return (
+            '/api/v1/categories/',
+            '/api/v1/categories/?search=Фильм',
+            '/api/v1/genres/',
+            '/api/v1/titles/',
+            '/api/v1/titles/?genre=fantasy&year=1931',
+            '/api/v1/titles/?fields=id,genre,rating',
+            '/api/v1/titles/?omit=category,description',
+            f'/api/v1/titles/{title_id}/',
+            f'/api/v1/titles/{titles[1]["id"]}/?fields=name,rating',
+            reviews_url,
+            f'{reviews_url}{reviews[0]["id"]}/',
+            f'{reviews_url}?omit=author',
+            comments_url,
+            f'{comments_url}{comments[0]["id"]}/',
+        )
+
+    def test_01_output_matches_drf(self, monkeypatch, client, admin_client,
+                                   user_client, moderator_client, user,
+                                   moderator):
+        from django.core.cache import cache
+
+        import api.mixins
+
+        urls = self.get_urls(
+            admin_client, user_client, moderator_client, user, moderator
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, url
+            monkeypatch.setattr(
+                api.mixins, 'COMPILED_SERIALIZERS_ENABLED', False
+            )
+            cache.clear()
+            expected = client.get(url)
+            monkeypatch.undo()
+            assert response.content == expected.content, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` совпадает с '
+                'ответом DRF-сериализатора байт в байт.'
+            )
+
+    def test_02_missing_object(self, client):
+        response = client.get('/api/v1/titles/100500/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что GET-запрос к несуществующему произведению '
+            'возвращает статус 404.'
+        )
+
+    def test_03_unsupported_serializer(self):
+        from rest_framework import serializers
+
+        from api.compiled import get_compiled_serializer
+        from reviews.models import Title
+
+        class MethodSerializer(serializers.ModelSerializer):
+            upper = serializers.SerializerMethodField()
+
+            def get_upper(self, obj):
+                return obj.name.upper()
+
+            class Meta:
+                model = Title
+                fields = ('id', 'upper')
+
+        assert get_compiled_serializer(
+            MethodSerializer, ('id', 'upper'), MethodSerializer
+        ) is None, (
+            'Сериализаторы с неподдерживаемыми полями должны обрабатываться '
+            'через DRF.'
+        )
+
+    def test_04_read_serializers_are_compiled(self):
+        from api import serializers
+        from api.compiled import get_compiled_serializer
+
+        for serializer_class in (
+            serializers.CategorySerializer,
+            serializers.GenreSerializer,
+            serializers.ReadOnlyTitleSerializer,
+            serializers.ReviewSerializer,
+            serializers.CommentSerializer,
+        ):
+            fields = serializer_class.Meta.fields
+            assert get_compiled_serializer(
+                serializer_class, fields, serializer_class
+            ) is not None, (
+                f'Проверьте, что `{serializer_class.__name__}` '
+                'поддерживается быстрым путём сериализации.'
+            )
+
+    def test_05_pages_share_order(self, monkeypatch, client):
+        from io import StringIO
+
+        from django.core.cache import cache
+        from django.core.management import call_command
+
+        import api.mixins
+
+        call_command(
+            'generate_data', stdout=StringIO(), users=20, categories=3,
+            genres=5, titles=150, reviews=600, comments=0, seed=7
+        )
+        for page in (1, 2):
+            pages = {}
+            for name, query in (
+                ('documents', ''), ('compiled', '&fields=id,rating')
+            ):
+                response = client.get(f'/api/v1/titles/?page={page}{query}')
+                pages[name] = [
+                    title['id'] for title in response.json()['results']
+                ]
+            monkeypatch.setattr(
+                api.mixins, 'COMPILED_SERIALIZERS_ENABLED', False
+            )
+            cache.clear()
+            response = client.get(
+                f'/api/v1/titles/?page={page}&fields=id,rating'
+            )
+            monkeypatch.undo()
+            pages['drf'] = [
+                title['id'] for title in response.json()['results']
+            ]
+            expected = sorted(pages['documents'])
+            assert len(expected) == (100 if page == 1 else 50)
+            assert pages == dict.fromkeys(pages, expected), (
+                'Проверьте, что все пути списка произведений упорядочены по '
+                'id и разбивают его на страницы одинаково.'
+            )
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.fixture
+def shadow(monkeypatch):
+    from api.shadow import shadow_verifier
+
+    monkeypatch.setattr(shadow_verifier, 'sample_rate', 1.0)
+    shadow_verifier.reset()
+    yield shadow_verifier
+    shadow_verifier.wait(timeout=5)
+    shadow_verifier.reset()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ShadowAPI:
+
+    URL = '/api/v1/debug/shadow/'
+
+    def test_01_fast_paths_match(self, shadow, client, admin_client,
+                                 user_client, moderator_client, user,
+                                 moderator):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url in (
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            '/api/v1/titles/',
+            '/api/v1/titles/?fields=id,genre',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            reviews_url,
+            f'{reviews_url}{reviews[0]["id"]}/comments/',
+        ):
+            assert client.get(url).status_code == HTTPStatus.OK
+        shadow.wait(timeout=5)
+        summary = shadow.summary()
+        assert set(summary['checks']) == {
+            'categories-list', 'genres-list', 'titles-list',
+            'titles-list:documents', 'titles-retrieve:documents',
+            'reviews-list', 'comments-list',
+        }
+        for name, results in summary['checks'].items():
+            assert results == {'match': results['match']}, (
+                f'Проверьте, что быстрый путь `{name}` совпадает с эталонным '
+                f'ответом DRF: {summary["samples"]}'
+            )
+
+    def test_02_mismatch_recorded(self, shadow):
+        shadow.submit('titles-list', [{'id': 1, 'name': 'Б'}],
+                      lambda: [{'id': 1, 'name': 'А'}])
+        shadow.submit('titles-list', [{'name': 'А', 'id': 1}],
+                      lambda: [{'id': 1, 'name': 'А'}])
+        shadow.submit('titles-list', [], lambda: 1 / 0)
+        shadow.wait(timeout=5)
+        summary = shadow.summary()
+        assert summary['checks'] == {
+            'titles-list': {'mismatch': 2, 'error': 1}
+        }
+        # Checks run on a worker pool, so samples arrive in any order.
+        paths = sorted(
+            difference['path']
+            for sample in summary['samples']
+            for difference in sample.get('differences', ())
+        )
+        assert paths == ['$[0]', '$[0].name'], (
+            'Проверьте, что расхождения записываются с путём к полю, '
+            'включая порядок ключей.'
+        )
+
+    def test_03_admin_only(self, client, user_client, admin_client):
+        assert client.get(self.URL).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(self.URL).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.get(self.URL)
+        assert response.status_code == HTTPStatus.OK
+        assert {'sample_rate', 'pending', 'checks', 'samples'} <= set(
+            response.json()
+        )
+        response = admin_client.delete(self.URL)
+        assert response.status_code == HTTPStatus.NO_CONTENT
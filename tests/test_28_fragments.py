@@ -0,0 +1,110 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+
+def file_cache(path):
+    return override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(path),
+    }})
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28FragmentCacheAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_fragments_reused(self, client, admin_client, monkeypatch):
+        from tests.utils import create_titles
+
+        monkeypatch.setattr('api.views.MATERIALIZED_TITLES_ENABLED', False)
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as cold:
+            expected = client.get(self.TITLES_URL)
+        with CaptureQueriesContext(connection) as warm:
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.content == expected.content
+        assert len(warm) < len(cold), (
+            'Проверьте, что жанры и категории берутся из кеша фрагментов '
+            'при повторном запросе.'
+        )
+
+    def test_02_category_update_invalidates(self, client, admin_client):
+        from reviews.models import Category
+        from tests.utils import create_titles
+
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        category = Category.objects.get(slug=titles[0]['category'])
+        category.name = 'Новое имя'
+        category.save()
+        response = client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert response.json()['category']['name'] == 'Новое имя', (
+            'Проверьте, что изменение категории сбрасывает её фрагмент.'
+        )
+
+    def test_03_author_update_invalidates(self, client, admin_client,
+                                          user_client, moderator_client,
+                                          user, moderator):
+        reviews, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        client.get(url)
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        authors = {
+            review['author'] for review in client.get(url).json()['results']
+        }
+        assert authors == {'renamed', moderator.username}, (
+            'Проверьте, что изменение пользователя сбрасывает фрагмент '
+            'автора в списке отзывов.'
+        )
+
+    def test_04_local_cache_disabled(self, client, admin_client,
+                                     monkeypatch):
+        from tests.utils import create_titles
+
+        monkeypatch.setattr('api.views.MATERIALIZED_TITLES_ENABLED', False)
+        monkeypatch.setattr('api.cache.CACHE_SINGLE_PROCESS', False)
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as cold:
+            client.get(self.TITLES_URL)
+        with CaptureQueriesContext(connection) as warm:
+            client.get(self.TITLES_URL)
+        assert len(warm) == len(cold), (
+            'Проверьте, что кеш фрагментов отключён, если кеш по умолчанию '
+            'локален для процесса и CACHE_SINGLE_PROCESS=False.'
+        )
+
+    def test_05_shared_cache_between_workers(self, client, admin_client,
+                                             monkeypatch, tmp_path):
+        from reviews.models import Category
+        from tests.utils import create_titles
+
+        monkeypatch.setattr('api.views.MATERIALIZED_TITLES_ENABLED', False)
+        monkeypatch.setattr('api.cache.CACHE_SINGLE_PROCESS', False)
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        with file_cache(tmp_path):
+            client.get(url)
+        # Each override creates a new cache connection, like another worker.
+        with file_cache(tmp_path):
+            category = Category.objects.get(slug=titles[0]['category'])
+            category.name = 'Новое имя'
+            category.save()
+        with file_cache(tmp_path):
+            response = client.get(url)
+        assert response.json()['category']['name'] == 'Новое имя', (
+            'Проверьте, что изменение в одном процессе сбрасывает фрагменты '
+            'в общем кеше для остальных процессов.'
+        )
@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews, create_single_review, create_titles
+
+
+def disable_fast_paths(monkeypatch):
+    monkeypatch.setattr('api.views.MATERIALIZED_TITLES_ENABLED', False)
+    monkeypatch.setattr('api.mixins.COMPILED_SERIALIZERS_ENABLED', False)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29TitleDocumentsAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_document(self, title_id):
+        from reviews.models import Title
+
+        return Title.objects.get(pk=title_id).document
+
+    def test_01_output_matches_drf(self, monkeypatch, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        urls = (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}?genre=fantasy',
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+        )
+        responses = [client.get(url) for url in urls]
+        disable_fast_paths(monkeypatch)
+        for url, response in zip(urls, responses):
+            assert response.status_code == HTTPStatus.OK
+            assert response.content == client.get(url).content, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` из сохранённых '
+                'документов совпадает с ответом DRF байт в байт.'
+            )
+
+    def test_02_documents_follow_changes(self, client, admin_client,
+                                         user_client, moderator_client,
+                                         user, moderator):
+        from reviews.models import Genre
+
+        reviews, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title_id = titles[0]['id']
+        assert self.get_document(title_id) is not None, (
+            'Проверьте, что документ произведения сохраняется при записи.'
+        )
+        url = f'{self.TITLES_URL}{title_id}/'
+        assert client.get(url).json()['rating'] == 5
+
+        create_single_review(admin_client, title_id, 'Отзыв', 8)
+        assert client.get(url).json()['rating'] == 6, (
+            'Проверьте, что новый отзыв пересобирает документ произведения.'
+        )
+
+        genre = Genre.objects.get(slug=client.get(url).json()['genre'][0]
+                                  ['slug'])
+        genre.name = 'Переименованный'
+        genre.save()
+        assert 'Переименованный' in [
+            item['name'] for item in client.get(url).json()['genre']
+        ], 'Проверьте, что изменение жанра пересобирает документы.'
+
+        category_slug = client.get(url).json()['category']['slug']
+        response = admin_client.delete(f'/api/v1/categories/{category_slug}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(url).json()['category'] is None, (
+            'Проверьте, что удаление категории пересобирает документы.'
+        )
+
+    def test_03_missing_documents_rebuilt(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        Title.objects.update(document=None)
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == len(titles)
+        assert not Title.objects.filter(document__isnull=True).exists(), (
+            'Проверьте, что отсутствующие документы собираются при чтении.'
+        )
+
+        Title.objects.update(document=None)
+        call_command('refresh_title_documents', missing=True)
+        assert not Title.objects.filter(document__isnull=True).exists()
+
+    def test_04_sparse_fields_bypass_documents(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?fields=id,name')
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name'}
+
+    def test_05_multi_genre_filter(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        # The first title has two genres matching `o`: horror and comedy.
+        response = client.get(f'{self.TITLES_URL}?genre=o')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 1
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']
+        ], (
+            'Проверьте, что список из сохранённых документов не дублирует '
+            'произведения с несколькими подходящими жанрами.'
+        )
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/?genre=o'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['id'] == titles[0]['id']
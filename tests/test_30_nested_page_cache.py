@@ -0,0 +1,151 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.test_28_fragments import file_cache
+from tests.utils import create_comments, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30NestedPageCacheAPI:
+
+    REVIEWS_URL = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+
+    def create_data(self, admin_client, user_client, moderator_client, user,
+                    moderator):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title_id = titles[0]['id']
+        urls = {
+            'reviews': self.REVIEWS_URL.format(title_id=title_id),
+            'first': self.COMMENTS_URL.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+            'second': self.COMMENTS_URL.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+        }
+        return urls, reviews, titles
+
+    def test_01_pages_cached(self, client, admin_client, user_client,
+                             moderator_client, user, moderator):
+        urls, _, _ = self.create_data(
+            admin_client, user_client, moderator_client, user, moderator
+        )
+        for url in urls.values():
+            expected = client.get(url)
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json() == expected.json()
+            assert len(context) == 0, (
+                f'Проверьте, что повторный GET-запрос к `{url}` отдаётся '
+                'из кеша без запросов к базе.'
+            )
+
+    def test_02_comment_invalidates_only_its_review(
+        self, client, admin_client, user_client, moderator_client, user,
+        moderator
+    ):
+        urls, reviews, titles = self.create_data(
+            admin_client, user_client, moderator_client, user, moderator
+        )
+        for url in urls.values():
+            client.get(url)
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'новый'
+        )
+        response = client.get(urls['first'])
+        assert response.json()['count'] == 3, (
+            'Проверьте, что новый комментарий сбрасывает кеш страниц '
+            'комментариев своего отзыва.'
+        )
+        for name in ('second', 'reviews'):
+            with CaptureQueriesContext(connection) as context:
+                client.get(urls[name])
+            assert len(context) == 0, (
+                'Проверьте, что новый комментарий не сбрасывает кеш '
+                'страниц других отзывов и списка отзывов.'
+            )
+
+    def test_03_review_changes_invalidate(
+        self, client, admin_client, user_client, moderator_client, user,
+        moderator
+    ):
+        urls, reviews, titles = self.create_data(
+            admin_client, user_client, moderator_client, user, moderator
+        )
+        client.get(urls['reviews'])
+        client.get(urls['first'])
+        admin_client.patch(
+            f'{urls["reviews"]}{reviews[1]["id"]}/', data={'text': 'правка'}
+        )
+        texts = {
+            review['text']
+            for review in client.get(urls['reviews']).json()['results']
+        }
+        assert 'правка' in texts, (
+            'Проверьте, что изменение отзыва сбрасывает кеш списка отзывов.'
+        )
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Новое имя'}
+        )
+        titles_in_page = {
+            review['title']
+            for review in client.get(urls['reviews']).json()['results']
+        }
+        assert titles_in_page == {'Новое имя'}, (
+            'Проверьте, что изменение произведения сбрасывает кеш его '
+            'отзывов.'
+        )
+        admin_client.delete(f'{urls["reviews"]}{reviews[0]["id"]}/')
+        response = client.get(urls['first'])
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что после удаления отзыва его комментарии не '
+            'отдаются из кеша.'
+        )
+
+    def test_04_shared_cache_between_workers(
+        self, client, admin_client, user_client, moderator_client, user,
+        moderator, monkeypatch, tmp_path
+    ):
+        monkeypatch.setattr('api.cache.CACHE_SINGLE_PROCESS', False)
+        urls, reviews, titles = self.create_data(
+            admin_client, user_client, moderator_client, user, moderator
+        )
+        with file_cache(tmp_path):
+            client.get(urls['first'])
+        # Each override creates a new cache connection, like another worker.
+        with file_cache(tmp_path):
+            create_single_comment(
+                user_client, titles[0]['id'], reviews[0]['id'], 'новый'
+            )
+        with file_cache(tmp_path):
+            response = client.get(urls['first'])
+            with CaptureQueriesContext(connection) as context:
+                client.get(urls['first'])
+        assert response.json()['count'] == 3, (
+            'Проверьте, что новый комментарий в одном процессе сбрасывает '
+            'страницы комментариев в общем кеше для остальных процессов.'
+        )
+        assert len(context) == 0
+
+    def test_05_local_cache_disabled(
+        self, client, admin_client, user_client, moderator_client, user,
+        moderator, monkeypatch
+    ):
+        monkeypatch.setattr('api.cache.CACHE_SINGLE_PROCESS', False)
+        urls, _, _ = self.create_data(
+            admin_client, user_client, moderator_client, user, moderator
+        )
+        client.get(urls['first'])
+        with CaptureQueriesContext(connection) as context:
+            client.get(urls['first'])
+        assert len(context) > 0, (
+            'Проверьте, что страницы не кешируются, если кеш по умолчанию '
+            'локален для процесса и CACHE_SINGLE_PROCESS=False.'
+        )